@@ -0,0 +1,119 @@
+"""Compares `qBitrr.utils.ExpiringSet` with the implementation it replaced.
+
+Run from the repository root:
+
+    python benchmarks/expiring_set.py [sizes...]
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from qBitrr.utils import ExpiringSet  # noqa: E402
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+class LegacyExpiringSet:
+    """`ExpiringSet` as it was before it was backed by a deque."""
+
+    def __init__(self, *args, **kwargs):
+        max_age_seconds = kwargs.get("max_age_seconds", 0)
+        assert max_age_seconds > 0
+        self.age = max_age_seconds
+        self.container = {}
+        for arg in args:
+            self.add(arg)
+
+    def extend(self, args):
+        for arg in args:
+            self.add(arg)
+
+    def add(self, value):
+        self.container[value] = time.time()
+
+    def contains(self, value):
+        if value not in self.container:
+            return False
+        if time.time() - self.container[value] > self.age:
+            self.container.pop(value, None)
+            return False
+        return True
+
+    __contains__ = contains
+
+    def __iter__(self):
+        self.__update__()
+        return iter(self.container.copy())
+
+    def __len__(self):
+        self.__update__()
+        return len(self.container)
+
+    def __update__(self):
+        for k, b in self.container.copy().items():
+            if time.time() - b > self.age:
+                del self.container[k]
+                return False
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(cls: type, keys: list[str]) -> dict[str, float]:
+    results = {}
+    expiring = cls(max_age_seconds=600)
+    add = expiring.add
+    results["add"] = timed(lambda: [add(k) for k in keys])
+    results["extend"] = timed(lambda: cls(max_age_seconds=600).extend(keys))
+    results["contains"] = timed(lambda: sum(k in expiring for k in keys))
+    results["len"] = timed(lambda: [len(expiring) for _ in range(10)]) / 10
+    results["iter"] = timed(lambda: list(expiring))
+    # Half of the items expired, the next len() has to drop all of them.
+    stale = cls(max_age_seconds=1)
+    stale.extend(keys)
+    if cls is LegacyExpiringSet:
+        for key in keys[::2]:
+            stale.container[key] -= 5
+    else:
+        stale._next_eviction = -1
+        stale._queue = type(stale._queue)(
+            sorted(
+                ((expiry - 5 if i % 2 == 0 else expiry, key))
+                for i, (expiry, key) in enumerate(stale._queue)
+            )
+        )
+        for expiry, key in stale._queue:
+            stale.container[key] = expiry
+    results["evict"] = timed(lambda: len(stale))
+    results["left"] = len(stale.container) / len(keys)
+    return results
+
+
+def main(sizes: list[int]) -> None:
+    header = f"{'size':>9} {'impl':>7}" + "".join(
+        f" {name:>10}" for name in ("add", "extend", "contains", "len", "iter", "evict")
+    )
+    print(header)
+    for size in sizes:
+        keys = [f"{i:040x}" for i in range(size)]
+        for name, cls in (("legacy", LegacyExpiringSet), ("current", ExpiringSet)):
+            results = run(cls, keys)
+            print(
+                f"{size:>9} {name:>7}"
+                + "".join(
+                    f" {results[field] * 1000:>8.2f}ms"
+                    for field in ("add", "extend", "contains", "len", "iter", "evict")
+                )
+                + f"  ({results['left']:.0%} kept after evicting)"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or list(DEFAULT_SIZES))
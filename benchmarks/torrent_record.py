@@ -0,0 +1,116 @@
+"""Compares `TorrentRecord` with the `TorrentDictionary` objects it replaced.
+
+Every torrent loop builds one object per torrent from the sync data, this
+measures the memory those objects hold and the time and allocations it takes
+to build them.
+
+Run from the repository root:
+
+    python benchmarks/torrent_record.py [count]
+"""
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from qbittorrentapi import TorrentDictionary  # noqa: E402
+
+from qBitrr.torrent_sync import TorrentRecord  # noqa: E402
+
+DEFAULT_COUNT = 100_000
+
+
+def make_torrent(i: int) -> dict:
+    """Returns a torrent with the 45 fields qBit 4.3 reports in its sync data."""
+    return {
+        "added_on": 1_600_000_000 + i,
+        "amount_left": 0,
+        "auto_tmm": False,
+        "availability": -1,
+        "category": "sonarr-tv",
+        "completed": 1_073_741_824,
+        "completion_on": 1_600_003_600 + i,
+        "content_path": f"/downloads/Show.S01E{i % 100:02d}.1080p-GROUP{i}",
+        "dl_limit": -1,
+        "dlspeed": 0,
+        "downloaded": 1_073_741_824,
+        "downloaded_session": 0,
+        "eta": 8_640_000,
+        "f_l_piece_prio": False,
+        "force_start": False,
+        "hash": f"{i:040x}",
+        "last_activity": 1_600_007_200 + i,
+        "magnet_uri": f"magnet:?xt=urn:btih:{i:040x}",
+        "max_ratio": -1,
+        "max_seeding_time": -1,
+        "name": f"Show.S01E{i % 100:02d}.1080p-GROUP{i}",
+        "num_complete": 12,
+        "num_incomplete": 1,
+        "num_leechs": 0,
+        "num_seeds": 0,
+        "priority": 0,
+        "progress": 1,
+        "ratio": 0.52,
+        "ratio_limit": -2,
+        "save_path": "/downloads/",
+        "seeding_time": 36_000,
+        "seeding_time_limit": -2,
+        "seen_complete": 1_600_003_600 + i,
+        "seq_dl": False,
+        "size": 1_073_741_824,
+        "state": "stalledUP",
+        "super_seeding": False,
+        "tags": "",
+        "time_active": 40_000,
+        "total_size": 1_073_741_824,
+        "tracker": "https://tracker.example/announce",
+        "trackers_count": 1,
+        "up_limit": -1,
+        "uploaded": 558_345_748,
+        "uploaded_session": 0,
+    }
+
+
+def measure(build, torrents: list[dict]) -> tuple[float, float, float]:
+    """Returns the bytes held per torrent, the build time and the blocks allocated."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    snapshot_before = tracemalloc.take_snapshot()
+    objects = [build(t) for t in torrents]
+    after, _ = tracemalloc.get_traced_memory()
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(
+        stat.count_diff
+        for stat in snapshot_after.compare_to(snapshot_before, "filename")
+        if stat.count_diff > 0
+    )
+    del objects
+    gc.collect()
+    start = time.perf_counter()
+    objects = [build(t) for t in torrents]
+    elapsed = time.perf_counter() - start
+    del objects
+    return (after - before) / len(torrents), elapsed, blocks / len(torrents)
+
+
+def main(count: int) -> None:
+    torrents = [make_torrent(i) for i in range(count)]
+    print(f"{count} torrents, {len(torrents[0])} fields each")
+    print(f"{'impl':>18} {'bytes/torrent':>14} {'build time':>11} {'blocks/torrent':>15}")
+    for name, build in (
+        ("TorrentDictionary", lambda t: TorrentDictionary(t, client=None)),
+        ("TorrentRecord", TorrentRecord),
+    ):
+        size, elapsed, blocks = measure(build, torrents)
+        print(f"{name:>18} {size:>14.0f} {elapsed:>10.2f}s {blocks:>15.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import contextlib
+import functools
+import hashlib
 import itertools
+import json
 import logging
 import pathlib
 import re
 import sys
+import threading
 import time
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, defaultdict
+from concurrent.futures import wait
 from copy import copy
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Callable, Iterable, Iterator, NoReturn
@@ -17,22 +21,29 @@ import ffmpeg
 import pathos
 import qbittorrentapi
 import requests
-from peewee import JOIN, SqliteDatabase
+from cachetools import TTLCache
+from peewee import JOIN, DatabaseError, SqliteDatabase, chunked
 from pyarr import RadarrAPI, SonarrAPI
-from qbittorrentapi import TorrentDictionary, TorrentStates
+from qbittorrentapi import TorrentStates
 
 from qBitrr.arr_tables import CommandsModel, EpisodesModel, MoviesModel, SeriesModel
+from qBitrr.async_engine import AsyncEngine
+from qBitrr.classifier import LOG_ONLY_BUCKETS, Bucket, TorrentSnapshot, classify, np
 from qBitrr.config import (
     APPDATA_FOLDER,
     COMPLETED_DOWNLOAD_FOLDER,
+    CONCURRENT_REQUESTS,
     CONFIG,
     FAILED_CATEGORY,
+    FORCE_GRAB_RATE,
     LOOP_SLEEP_TIMER,
+    MAX_CACHE_ENTRIES,
     NO_INTERNET_SLEEP_TIMER,
     PROCESS_ONLY,
     QBIT_DISABLED,
     RECHECK_CATEGORY,
     SEARCH_ONLY,
+    VECTORIZED_TORRENT_PROCESSING,
 )
 from qBitrr.errors import (
     DelayLoopException,
@@ -41,7 +52,12 @@ from qBitrr.errors import (
     SkipException,
     UnhandledError,
 )
+from qBitrr.grab_dispatcher import GrabDispatcher
 from qBitrr.logger import run_logs
+from qBitrr.per_process import per_process_executor, per_process_sqlite
+from qBitrr.queue_snapshot import QueueSnapshot
+from qBitrr.search_slots import SearchSlots
+from qBitrr.state_store import StateStore
 from qBitrr.tables import (
     EpisodeFilesModel,
     EpisodeQueueModel,
@@ -49,17 +65,58 @@ from qBitrr.tables import (
     MovieQueueModel,
     MoviesFilesModel,
     SeriesFilesModel,
+    TorrentFilesModel,
 )
+from qBitrr.torrent_sync import TorrentRecord
 from qBitrr.utils import (
+    BoundedSet,
     ExpiringSet,
     absolute_file_paths,
+    approximate_size,
     has_internet,
+    infohash,
     validate_and_return_torrent_file,
 )
 
 if TYPE_CHECKING:
     from qBitrr.main import qBitManager
 
+# The torrent loop backs off up to this many times LoopSleepTimer when idle.
+MAX_LOOP_SLEEP_MULTIPLIER = 12
+# Changes to these fields wake an idle torrent loop up straight away.
+WAKE_ON_TORRENT_FIELDS = frozenset(
+    {
+        "state",
+        "category",
+        "tags",
+        "completion_on",
+        "content_path",
+        "tracker",
+        "trackers_count",
+    }
+)
+# Number of threads each Arr instance uses to force grab delayed releases.
+FORCE_GRAB_WORKERS = 4
+# How long the number of active search commands is reused before it is counted again, in seconds.
+SEARCH_SLOTS_MAX_AGE = 5
+# Once an Arr instance sends webhook events its queue is only polled this often, in seconds.
+QUEUE_SWEEP_INTERVAL = 300
+# Without an Arr webhook event for this long its queue is polled on every loop again, in seconds.
+ARR_EVENT_WINDOW = 3600
+# Number of Arr queue records requested per page.
+QUEUE_PAGE_SIZE = 500
+# The torrent loop state is written to disk at most this often, in seconds.
+STATE_FLUSH_INTERVAL = 60
+# Entry counts and sizes of the long-lived collections are logged at most this often, in seconds.
+COLLECTION_REPORT_INTERVAL = 600
+# ExpiringSet attributes that are saved along with the torrent loop state.
+PERSISTED_EXPIRING_SETS = (
+    "timed_ignore_cache",
+    "timed_skip",
+    "tracker_delay",
+    "special_casing_file_check",
+)
+
 
 class Arr:
     def __init__(
@@ -187,11 +244,23 @@ class Arr:
         )
         self.search_ending_year = CONFIG.get(f"{name}.EntrySearch.LastYear", fallback=1990)
         self.search_command_limit = CONFIG.get(f"{name}.EntrySearch.SearchLimit", fallback=5)
+        self.search_batch_size = max(
+            CONFIG.get(f"{name}.EntrySearch.SearchBatchSize", fallback=10), 1
+        )
+        # (entry, persistent queue id) of the searches waiting to be posted together.
+        self.search_batch: list[tuple[EpisodeFilesModel | MoviesFilesModel, int]] = []
         self.prioritize_todays_release = CONFIG.get(
             f"{name}.EntrySearch.PrioritizeTodaysReleases", fallback=True
         )
 
         self.do_not_remove_slow = CONFIG.get(f"{name}.Torrent.DoNotRemoveSlow", fallback=False)
+        self.vectorized_processing = VECTORIZED_TORRENT_PROCESSING and np is not None
+        self.engine = AsyncEngine(CONCURRENT_REQUESTS)
+        self.torrent_workers = max(CONCURRENT_REQUESTS, 1)
+        self.torrent_pool = per_process_executor(self.torrent_workers, self._name)
+        # Held by the torrent workers while they read or change the per-torrent state.
+        self.torrent_state_lock = threading.Lock()
+        self.torrent_worker = threading.local()
 
         if self.search_in_reverse:
             self.search_current_year = self.search_ending_year
@@ -208,6 +277,27 @@ class Arr:
             self.arr_db_file = pathlib.Path(arr_db_file)
         self._app_data_folder = APPDATA_FOLDER
         self.search_db_file = self._app_data_folder.joinpath(f"{self._name}.db")
+        self.files_db_file = self._app_data_folder.joinpath(f"{self._name}.files.db")
+        self.torrent_files_db = per_process_sqlite(
+            self.files_db_file, TorrentFilesModel, "TorrentFiles", self._load_files_db
+        )
+        # Hashes with a row in the files database, so pruning it needs no query.
+        self.files_db_hashes: set[str] = set()
+        self.collections_reported_at = float("-inf")
+        self.state_store = StateStore(
+            self._app_data_folder.joinpath(f"{self._name}.state.db"), STATE_FLUSH_INTERVAL
+        )
+        self.arr_event_at = None
+        # Shared by the torrent and search processes, at most one fetch per loop.
+        self.queue_snapshot = QueueSnapshot(
+            self._app_data_folder.joinpath(f"{self._name}.queue.json"),
+            LOOP_SLEEP_TIMER,
+            self._fetch_queue,
+        )
+        self.grab_dispatcher = GrabDispatcher(
+            self._force_grab, FORCE_GRAB_WORKERS, FORCE_GRAB_RATE
+        )
+        self.search_slots = SearchSlots(self._count_search_commands, SEARCH_SLOTS_MAX_AGE)
         if self.search_missing and not self.arr_db_file.exists():
             self.logger.critical(
                 "Arr DB file cannot be located setting SearchMissing to False: %s",
@@ -270,6 +360,18 @@ class Arr:
             self.file_name_exclusion_regex_re = re.compile(
                 "|".join(self.file_name_exclusion_regex), re.IGNORECASE | re.DOTALL
             )
+        # File verdicts are only valid for the filters they were computed with.
+        self.file_filter_hash = hashlib.sha1(
+            json.dumps(
+                [
+                    self.case_sensitive_matches,
+                    self.folder_exclusion_regex,
+                    self.file_name_exclusion_regex,
+                    self.file_extension_allowlist,
+                ],
+                default=str,
+            ).encode()
+        ).hexdigest()
         self.client = client_cls(host_url=self.uri, api_key=self.apikey)
         if isinstance(self.client, SonarrAPI):
             self.type = "sonarr"
@@ -290,9 +392,14 @@ class Arr:
         self.cache = {}
         self.requeue_cache = {}
         self.queue_file_ids = set()
-        self.sent_to_scan = set()
+        self.queue_entries: dict[int, tuple] = {}
+        self.queue_ids_by_hash: defaultdict[str, set[int]] = defaultdict(set)
+        self.queue_file_id_counts: Counter[int] = Counter()
+        self.sent_to_scan = BoundedSet(MAX_CACHE_ENTRIES)
         self.sent_to_scan_hashes = set()
-        self.files_probed = set()
+        # Path or hash -> id of the scan command posted for it.
+        self.scan_commands: dict[str, int] = {}
+        self.files_probed = BoundedSet(MAX_CACHE_ENTRIES)
         self.import_torrents = []
         self.change_priority = dict()
         self.recheck = set()
@@ -301,7 +408,7 @@ class Arr:
         self.delete = set()
         self.resume = set()
         self.remove_from_qbit = set()
-        self.overseerr_requests_release_cache = dict()
+        self.overseerr_requests_release_cache = TTLCache(maxsize=MAX_CACHE_ENTRIES, ttl=86400)
         self.files_to_explicitly_delete: Iterator = iter([])
         self.missing_files_post_delete = set()
         self.downloads_with_bad_error_message_blocklist = set()
@@ -315,10 +422,24 @@ class Arr:
         self.expiring_bool = ExpiringSet(max_age_seconds=10)
         self.session = requests.Session()
         self.cleaned_torrents = set()
+        self.tracker_cache: dict[str, tuple[tuple[int, str], list]] = {}
+        self.torrent_fingerprints: dict[str, tuple[tuple, float]] = {}
+        self.completed_hooks: set[str] = set()
+        self.share_limits: defaultdict[tuple[float, int], set[str]] = defaultdict(set)
+        self.download_limits: defaultdict[int, set[str]] = defaultdict(set)
+        self.upload_limits: defaultdict[int, set[str]] = defaultdict(set)
+        self.super_seed = set()
+        self.tags_to_add: defaultdict[str, set[str]] = defaultdict(set)
+        self.tags_to_remove: defaultdict[str, set[str]] = defaultdict(set)
         self.search_api_command = None
 
         self.manager.completed_folders.add(self.completed_folder)
         self.manager.category_allowlist.add(self.category)
+        self.torrent_feed = None
+        if self.manager.qbit_manager.torrent_sync is not None:
+            self.torrent_feed = self.manager.qbit_manager.torrent_sync.register_feed(self.category)
+        self.loop_sleep_timer = LOOP_SLEEP_TIMER
+        self.last_loop_active = True
 
         self.logger.debug(
             "%s Config: "
@@ -363,6 +484,12 @@ class Arr:
             self.ignore_torrents_younger_than,
         )
         self.logger.debug("Script Config:  MaximumETA=%s", self.maximum_eta)
+        if VECTORIZED_TORRENT_PROCESSING and np is None:
+            self.logger.warning(
+                "VectorizedTorrentProcessing is enabled but NumPy is not installed, "
+                "falling back to processing torrents one at a time"
+            )
+        self.logger.debug("Script Config:  VectorizedProcessing=%s", self.vectorized_processing)
 
         if self.search_missing:
             self.logger.debug(
@@ -393,6 +520,10 @@ class Arr:
                 "Script Config:  CommandLimit=%s",
                 self.search_command_limit,
             )
+            self.logger.debug(
+                "Script Config:  SearchBatchSize=%s",
+                self.search_batch_size,
+            )
             self.logger.debug(
                 "Script Config:  DatabaseFile=%s",
                 self.arr_db_file,
@@ -489,7 +620,7 @@ class Arr:
         return False
 
     @staticmethod
-    def is_ignored_state(torrent: TorrentDictionary) -> bool:
+    def is_ignored_state(torrent: TorrentRecord) -> bool:
         return torrent.state_enum in (
             TorrentStates.FORCED_DOWNLOAD,
             TorrentStates.FORCED_UPLOAD,
@@ -502,7 +633,7 @@ class Arr:
         )
 
     @staticmethod
-    def is_uploading_state(torrent: TorrentDictionary) -> bool:
+    def is_uploading_state(torrent: TorrentRecord) -> bool:
         return torrent.state_enum in (
             TorrentStates.UPLOADING,
             TorrentStates.STALLED_UPLOAD,
@@ -510,7 +641,7 @@ class Arr:
         )
 
     @staticmethod
-    def is_complete_state(torrent: TorrentDictionary) -> bool:
+    def is_complete_state(torrent: TorrentRecord) -> bool:
         """Returns True if the State is categorized as Complete."""
         return torrent.state_enum in (
             TorrentStates.UPLOADING,
@@ -520,7 +651,7 @@ class Arr:
         )
 
     @staticmethod
-    def is_downloading_state(torrent: TorrentDictionary) -> bool:
+    def is_downloading_state(torrent: TorrentRecord) -> bool:
         """Returns True if the State is categorized as Downloading."""
         return torrent.state_enum in (
             TorrentStates.DOWNLOADING,
@@ -575,42 +706,30 @@ class Arr:
             elif self.type == "radarr":
                 type_ = "movie"
             _now = datetime.now()
+            response = [
+                entry
+                for entry in response
+                if entry.get("type") == type_
+                and not (
+                    self.overseerr_approved_only and entry.get("media", {}).get(status_key) == 5
+                )
+            ]
+            # Release dates are fetched once a day per request, all the missing ones at once.
+            missing = [
+                entry.get("id")
+                for entry in response
+                if entry.get("id") not in self.overseerr_requests_release_cache
+            ]
+            dates = self.engine.run(
+                functools.partial(self._get_overseerr_release_date, type_, id_) for id_ in missing
+            )
+            for id_, date in zip(missing, dates):
+                if date is not None:
+                    self.overseerr_requests_release_cache[id_] = date
             for entry in response:
-                type__ = entry.get("type")
-                id__ = entry.get("id")
-                if type_ != type__:
-                    continue
-                if self.overseerr_approved_only and entry.get("media", {}).get(status_key) == 5:
-                    continue
-                if id__ in self.overseerr_requests_release_cache:
-                    date = self.overseerr_requests_release_cache[id__]
-                else:
-                    date = datetime(day=1, month=1, year=1970)
-                    date_string_backup = f"{_now.year}-{_now.month:02}-{_now.day:02}"
-                    date_string = None
-                    try:
-                        if type_ == "movie":
-                            _entry_data = self.session.get(
-                                url=f"{self.overseerr_uri}/api/v1/movies/{id__}",
-                                headers={"X-Api-Key": self.overseerr_api_key},
-                                timeout=2,
-                            )
-                            date_string = _entry_data.json().get("releaseDate")
-                        elif type__ == "tv":
-                            _entry_data = self.session.get(
-                                url=f"{self.overseerr_uri}/api/v1/tv/{id__}",
-                                headers={"X-Api-Key": self.overseerr_api_key},
-                                timeout=2,
-                            )
-                            # We don't do granular (episode/season) searched here so no need to
-                            # suppose them
-                            date_string = _entry_data.json().get("firstAirDate")
-                        if not date_string:
-                            date_string = date_string_backup
-                        date = datetime.strptime(date_string, "%Y-%m-%d")
-                        self.overseerr_requests_release_cache[id__] = date
-                    except Exception as e:
-                        self.logger.warning("Failed to query release date from Overserr: %s", e)
+                date = self.overseerr_requests_release_cache.get(
+                    entry.get("id"), datetime(day=1, month=1, year=1970)
+                )
                 if date > _now:
                     continue
                 if media := entry.get("media"):
@@ -632,6 +751,33 @@ class Arr:
         else:
             return self._temp_overseer_request_cache
 
+    def _get_overseerr_release_date(self, type_: str, id_: int) -> datetime | None:
+        _now = datetime.now()
+        date_string_backup = f"{_now.year}-{_now.month:02}-{_now.day:02}"
+        date_string = None
+        try:
+            if type_ == "movie":
+                _entry_data = self.session.get(
+                    url=f"{self.overseerr_uri}/api/v1/movies/{id_}",
+                    headers={"X-Api-Key": self.overseerr_api_key},
+                    timeout=2,
+                )
+                date_string = _entry_data.json().get("releaseDate")
+            elif type_ == "tv":
+                _entry_data = self.session.get(
+                    url=f"{self.overseerr_uri}/api/v1/tv/{id_}",
+                    headers={"X-Api-Key": self.overseerr_api_key},
+                    timeout=2,
+                )
+                # We don't do granular (episode/season) searched here so no need to
+                # suppose them
+                date_string = _entry_data.json().get("firstAirDate")
+            if not date_string:
+                date_string = date_string_backup
+            return datetime.strptime(date_string, "%Y-%m-%d")
+        except Exception as e:
+            self.logger.warning("Failed to query release date from Overserr: %s", e)
+
     def _get_overseerr_requests_count(self) -> int:
         self._get_oversee_requests_all()
         if self.type == "sonarr":
@@ -702,21 +848,27 @@ class Arr:
         if self.pause:
             self.needs_cleanup = True
             self.logger.debug("Pausing %s completed torrents", len(self.pause))
-            for i in self.pause:
-                self.logger.debug(
-                    "Pausing %s (%s)",
-                    i,
-                    self.manager.qbit_manager.name_cache.get(i),
-                )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                names = self.manager.qbit_manager.torrent_index.names(self.pause)
+                for i in self.pause:
+                    self.logger.debug("Pausing %s (%s)", i, names.get(i))
             self.manager.qbit.torrents_pause(torrent_hashes=self.pause)
+            self._request_torrent_sync()
             self.pause.clear()
 
     def _process_imports(self) -> None:
         if self.import_torrents:
             self.needs_cleanup = True
+            self._prune_scan_commands()
+            commands, keys = [], []
             for torrent in self.import_torrents:
                 if torrent.hash in self.sent_to_scan:
                     continue
+                if torrent.hash in self.scan_commands:
+                    self.logger.trace(
+                        "Scan of %s (%s) is still queued or running", torrent.name, torrent.hash
+                    )
+                    continue
                 path = validate_and_return_torrent_file(torrent.content_path)
                 if not path.exists():
                     self.timed_ignore_cache.add(torrent.hash)
@@ -728,7 +880,7 @@ class Arr:
                         path,
                     )
                     continue
-                if path in self.sent_to_scan:
+                if path in self.sent_to_scan or str(path) in self.scan_commands:
                     continue
                 self.sent_to_scan_hashes.add(torrent.hash)
                 if self.type == "sonarr":
@@ -736,95 +888,153 @@ class Arr:
                         "DownloadedEpisodesScan: %s",
                         path,
                     )
-                    self.post_command(
-                        "DownloadedEpisodesScan",
-                        path=str(path),
-                        downloadClientId=torrent.hash.upper(),
-                        importMode=self.import_mode,
-                    )
+                    command = "DownloadedEpisodesScan"
                 elif self.type == "radarr":
                     self.logger.success("DownloadedMoviesScan: %s", path)
-                    self.post_command(
-                        "DownloadedMoviesScan",
+                    command = "DownloadedMoviesScan"
+                commands.append(
+                    functools.partial(
+                        self.post_command,
+                        command,
                         path=str(path),
                         downloadClientId=torrent.hash.upper(),
                         importMode=self.import_mode,
                     )
+                )
+                keys.append((torrent.hash, str(path)))
                 self.sent_to_scan.add(path)
             self.import_torrents.clear()
+            for (hash_, path), res in zip(keys, self.engine.run(commands)):
+                if isinstance(res, dict) and "id" in res:
+                    self.scan_commands[hash_] = self.scan_commands[path] = res["id"]
+
+    def _prune_scan_commands(self) -> None:
+        """Forgets the scan commands the Arr instance has finished with.
+
+        The status comes from the Arr `Commands` table when the search database is
+        set up, otherwise from the command API. Commands the Arr no longer lists
+        are treated as finished. If the status cannot be fetched every command is
+        kept, so a scan is never posted twice.
+        """
+        if not self.scan_commands:
+            return
+        ids = set(self.scan_commands.values())
+        try:
+            if self.search_missing:
+                self.register_search_mode()
+                query = self.model_arr_command.select(self.model_arr_command.Id).where(
+                    (self.model_arr_command.Id.in_(list(ids)))
+                    & (self.model_arr_command.EndedAt.is_null(True))
+                )
+                active = {id_ for id_, in query.tuples()}
+            else:
+                active = {
+                    command["id"]
+                    for command in self.client.request_get("/api/v3/command")
+                    if command.get("status") in {"queued", "started"}
+                }
+        except (requests.RequestException, ValueError, DatabaseError) as e:
+            self.logger.debug("Could not fetch the status of scan commands: %s", e)
+            return
+        finished = ids - active
+        if finished:
+            self.logger.trace("Scan commands finished: %s", sorted(finished))
+            self.scan_commands = {
+                key: id_ for key, id_ in self.scan_commands.items() if id_ not in finished
+            }
 
-    def _process_failed_individual(self, hash_: str, entry: int, skip_blacklist: set[str]) -> None:
-        with contextlib.suppress(Exception):
+    def _process_failed_entries(
+        self, payload: list[tuple[int, str]], skip_blacklist: set[str]
+    ) -> None:
+        """Removes failed downloads from the queue and searches for them again.
+
+        Queue entries are removed with one bulk request per blocklist setting and
+        everything is searched for again with a single command.
+        """
+        blocklist, no_blocklist = [], []
+        names = {}
+        if self.logger.isEnabledFor(logging.DEBUG):
+            names = self.manager.qbit_manager.torrent_index.names(h for _, h in payload)
+        for entry, hash_ in payload:
             if hash_ not in skip_blacklist:
+                self.logger.debug("Blocklisting: %s (%s)", hash_, names.get(hash_, "Deleted"))
+                blocklist.append(entry)
+            else:
+                no_blocklist.append(entry)
+            self.recently_queue.pop(hash_, None)
+        self.delete_from_queue_bulk(blocklist, blacklist=True)
+        self.delete_from_queue_bulk(no_blocklist, blacklist=False)
+        if not self.re_search:
+            return
+        queue = {e["id"]: e for e in self.queue if e.get("id") is not None}
+        entries = [
+            queue.get(entry, {"id": entry}) for entry, _ in payload if entry in self.requeue_cache
+        ]
+        if self.type == "sonarr":
+            object_ids = sorted(
+                {
+                    object_id
+                    for entry, _ in payload
+                    for object_id in self.requeue_cache.get(entry, ())
+                }
+            )
+            series_ids = {e["seriesId"] for e in entries if e.get("seriesId")}
+            command, key, persisted_ids = "EpisodeSearch", "episodeIds", series_ids
+        elif self.type == "radarr":
+            object_ids = sorted(
+                {object_id for entry, _ in payload if (object_id := self.requeue_cache.get(entry))}
+            )
+            command, key, persisted_ids = "MoviesSearch", "movieIds", object_ids
+        else:
+            return
+        if not object_ids:
+            return
+        for e in entries:
+            self.logger.notice("Re-Searching: %s", e.get("title", e["id"]))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            # Only fetched when they are going to be logged.
+            self.engine.run(
+                functools.partial(self._log_re_search, object_id) for object_id in object_ids
+            )
+        self.post_command(command, **{key: object_ids})
+        if self.persistent_queue:
+            for object_id in persisted_ids:
+                self.persistent_queue.insert(EntryId=object_id).on_conflict_ignore().execute()
+
+    def _log_re_search(self, object_id: int) -> None:
+        if self.type == "sonarr":
+            data = self.client.get_episode_by_episode_id(object_id)
+            if name := data.get("title"):
                 self.logger.debug(
-                    "Blocklisting: %s (%s)",
-                    hash_,
-                    self.manager.qbit_manager.name_cache.get(hash_, "Deleted"),
+                    "Re-Searching episode: %s (%s) | "
+                    "S%02dE%03d "
+                    "(E%04d) | "
+                    "%s | "
+                    "[tvdbId=%s|id=%s]",
+                    data.get("series", {}).get("title"),
+                    data.get("series", {}).get("year", 0),
+                    data.get("seasonNumber", 0),
+                    data.get("episodeNumber", 0),
+                    data.get("absoluteEpisodeNumber", 0),
+                    name,
+                    data.get("series", {}).get("tvdbId", 0),
+                    object_id,
                 )
-                self.delete_from_queue(id_=entry, blacklist=True)
-            else:
-                self.delete_from_queue(id_=entry, blacklist=False)
-        if hash_ in self.recently_queue:
-            del self.recently_queue[hash_]
-        object_id = self.requeue_cache.get(entry)
-        if self.re_search and object_id:
-            if self.type == "sonarr":
-                object_ids = object_id
-                for object_id in object_ids:
-                    data = self.client.get_episode_by_episode_id(object_id)
-                    name = data.get("title")
-                    series_id = data.get("series", {}).get("id")
-                    if name:
-                        episodeNumber = data.get("episodeNumber", 0)
-                        absoluteEpisodeNumber = data.get("absoluteEpisodeNumber", 0)
-                        seasonNumber = data.get("seasonNumber", 0)
-                        seriesTitle = data.get("series", {}).get("title")
-                        year = data.get("series", {}).get("year", 0)
-                        tvdbId = data.get("series", {}).get("tvdbId", 0)
-                        self.logger.notice(
-                            "Re-Searching episode: %s (%s) | "
-                            "S%02dE%03d "
-                            "(E%04d) | "
-                            "%s | "
-                            "[tvdbId=%s|id=%s]",
-                            seriesTitle,
-                            year,
-                            seasonNumber,
-                            episodeNumber,
-                            absoluteEpisodeNumber,
-                            name,
-                            tvdbId,
-                            object_id,
-                        )
-                    else:
-                        self.logger.notice(
-                            "Re-Searching episode: %s",
-                            object_id,
-                        )
-                    self.post_command("EpisodeSearch", episodeIds=[object_id])
-                    if self.persistent_queue and series_id:
-                        self.persistent_queue.insert(EntryId=series_id).on_conflict_ignore()
-            elif self.type == "radarr":
-                data = self.client.get_movie_by_movie_id(object_id)
-                name = data.get("title")
-                if name:
-                    year = data.get("year", 0)
-                    tmdbId = data.get("tmdbId", 0)
-                    self.logger.notice(
-                        "Re-Searching movie: %s (%s) | [tmdbId=%s|id=%s]",
-                        name,
-                        year,
-                        tmdbId,
-                        object_id,
-                    )
-                else:
-                    self.logger.notice(
-                        "Re-Searching movie: %s",
-                        object_id,
-                    )
-                self.post_command("MoviesSearch", movieIds=[object_id])
-                if self.persistent_queue:
-                    self.persistent_queue.insert(EntryId=object_id).on_conflict_ignore()
+        elif self.type == "radarr":
+            data = self.client.get_movie_by_movie_id(object_id)
+            if name := data.get("title"):
+                self.logger.debug(
+                    "Re-Searching movie: %s (%s) | [tmdbId=%s|id=%s]",
+                    name,
+                    data.get("year", 0),
+                    data.get("tmdbId", 0),
+                    object_id,
+                )
+
+    def _request_torrent_sync(self) -> None:
+        # Without this the next loop could act on torrent data fetched before the change.
+        if self.torrent_feed is not None:
+            self.torrent_feed.request_update()
 
     def _process_errored(self) -> None:
         # Recheck all torrents marked for rechecking.
@@ -832,8 +1042,8 @@ class Arr:
             self.needs_cleanup = True
             updated_recheck = [r for r in self.recheck]
             self.manager.qbit.torrents_recheck(torrent_hashes=updated_recheck)
-            for k in updated_recheck:
-                self.timed_ignore_cache.add(k)
+            self._request_torrent_sync()
+            self.timed_ignore_cache.extend(updated_recheck)
             self.recheck.clear()
 
     def _process_failed(self) -> None:
@@ -844,17 +1054,12 @@ class Arr:
             delete_ = True
         else:
             delete_ = False
-        skip_blacklist = {
-            i.upper() for i in self.skip_blacklist.union(self.missing_files_post_delete)
-        }
+        skip_blacklist = self.skip_blacklist.union(self.missing_files_post_delete)
         if to_delete_all:
             self.needs_cleanup = True
             payload, hashes = self.process_entries(to_delete_all)
             if payload:
-                for entry, hash_ in payload:
-                    self._process_failed_individual(
-                        hash_=hash_, entry=entry, skip_blacklist=skip_blacklist
-                    )
+                self._process_failed_entries(payload, skip_blacklist)
         if self.remove_from_qbit or self.skip_blacklist or to_delete_all:
             # Remove all bad torrents from the Client.
             temp_to_delete = set()
@@ -865,13 +1070,13 @@ class Arr:
                 self.manager.qbit.torrents_delete(hashes=temp_to_delete, delete_files=True)
 
             to_delete_all = to_delete_all.union(temp_to_delete)
+            self._request_torrent_sync()
+            self.manager.qbit_manager.torrent_index.remove(to_delete_all)
             for h in to_delete_all:
                 self.cleaned_torrents.discard(h)
                 self.sent_to_scan_hashes.discard(h)
-                if h in self.manager.qbit_manager.name_cache:
-                    del self.manager.qbit_manager.name_cache[h]
-                if h in self.manager.qbit_manager.cache:
-                    del self.manager.qbit_manager.cache[h]
+                self.tracker_cache.pop(h, None)
+            self._delete_torrent_files(to_delete_all & self.files_db_hashes)
         if delete_:
             self.missing_files_post_delete.clear()
             self.downloads_with_bad_error_message_blocklist.clear()
@@ -881,32 +1086,107 @@ class Arr:
 
     def _process_file_priority(self) -> None:
         # Set all files marked as "Do not download" to not download.
+        calls = []
+        if not self.change_priority:
+            return
+        names = self.manager.qbit_manager.torrent_index.names(self.change_priority)
         for hash_, files in self.change_priority.copy().items():
             self.needs_cleanup = True
-            name = self.manager.qbit_manager.name_cache.get(hash_)
-            if name:
+            if name := names.get(hash_):
                 self.logger.debug(
                     "Updating file priority on torrent: %s (%s)",
                     name,
                     hash_,
                 )
-                self.manager.qbit.torrents_file_priority(
-                    torrent_hash=hash_, file_ids=files, priority=0
+                calls.append(
+                    functools.partial(
+                        self.manager.qbit.torrents_file_priority,
+                        torrent_hash=hash_,
+                        file_ids=files,
+                        priority=0,
+                    )
                 )
             else:
                 self.logger.error("Torrent does not exist? %s", hash_)
             del self.change_priority[hash_]
+        if calls:
+            self.engine.run(calls)
+            self._request_torrent_sync()
+
+    def _set_share_limits(self, ratio_limit: float, seeding_time_limit: int, hashes: set[str]):
+        with contextlib.suppress(Exception):
+            self.manager.qbit.torrents_set_share_limits(
+                ratio_limit=ratio_limit,
+                seeding_time_limit=seeding_time_limit,
+                torrent_hashes=hashes,
+            )
+
+    def _process_torrent_settings(self) -> None:
+        # qBit accepts multiple hashes for all of these, so every group of torrents
+        # with the same target value only costs a single call.
+        qbit = self.manager.qbit
+        calls = []
+        for (ratio_limit, seeding_time_limit), hashes in self.share_limits.items():
+            self.logger.trace(
+                "Setting share limits (ratio: %s, seeding time: %s) on %s torrents",
+                ratio_limit,
+                seeding_time_limit,
+                len(hashes),
+            )
+            calls.append(
+                functools.partial(self._set_share_limits, ratio_limit, seeding_time_limit, hashes)
+            )
+        for limit, hashes in self.download_limits.items():
+            self.logger.trace("Setting download limit (%s) on %s torrents", limit, len(hashes))
+            calls.append(
+                functools.partial(
+                    qbit.torrents_set_download_limit, limit=limit, torrent_hashes=hashes
+                )
+            )
+        for limit, hashes in self.upload_limits.items():
+            self.logger.trace("Setting upload limit (%s) on %s torrents", limit, len(hashes))
+            calls.append(
+                functools.partial(
+                    qbit.torrents_set_upload_limit, limit=limit, torrent_hashes=hashes
+                )
+            )
+        if self.super_seed:
+            self.logger.trace("Enabling super seeding on %s torrents", len(self.super_seed))
+            calls.append(
+                functools.partial(
+                    qbit.torrents_set_super_seeding, enable=True, torrent_hashes=self.super_seed
+                )
+            )
+        for tag, hashes in self.tags_to_add.items():
+            self.logger.trace("Adding tag (%s) to %s torrents", tag, len(hashes))
+            calls.append(
+                functools.partial(qbit.torrents_add_tags, tags=tag, torrent_hashes=hashes)
+            )
+        for tag, hashes in self.tags_to_remove.items():
+            self.logger.trace("Removing tag (%s) from %s torrents", tag, len(hashes))
+            calls.append(
+                functools.partial(qbit.torrents_remove_tags, tags=tag, torrent_hashes=hashes)
+            )
+        if calls:
+            self.engine.run(calls)
+            self._request_torrent_sync()
+        self.share_limits.clear()
+        self.download_limits.clear()
+        self.upload_limits.clear()
+        self.super_seed.clear()
+        self.tags_to_add.clear()
+        self.tags_to_remove.clear()
 
     def _process_resume(self) -> None:
         if self.resume:
             self.needs_cleanup = True
             self.manager.qbit.torrents_resume(torrent_hashes=self.resume)
-            for k in self.resume:
-                self.timed_ignore_cache.add(k)
+            self._request_torrent_sync()
+            self.timed_ignore_cache.extend(self.resume)
             self.resume.clear()
 
     def _remove_empty_folders(self) -> None:
-        new_sent_to_scan = set()
+        new_sent_to_scan = BoundedSet(MAX_CACHE_ENTRIES)
         if not self.completed_folder.exists():
             return
         for path in absolute_file_paths(self.completed_folder):
@@ -919,7 +1199,7 @@ class Arr:
                     new_sent_to_scan.add(path)
         self.sent_to_scan = new_sent_to_scan
         if not len(list(absolute_file_paths(self.completed_folder))):
-            self.sent_to_scan = set()
+            self.sent_to_scan = BoundedSet(MAX_CACHE_ENTRIES)
             self.sent_to_scan_hashes = set()
 
     def api_calls(self) -> None:
@@ -946,15 +1226,17 @@ class Arr:
     def arr_db_query_commands_count(self) -> int:
         if not self.search_missing:
             return 0
-        search_commands = (
+        return self.search_slots.active()
+
+    def _count_search_commands(self) -> int:
+        return (
             self.model_arr_command.select()
             .where(
                 (self.model_arr_command.EndedAt.is_null(True))
                 & (self.model_arr_command.Name.endswith("Search"))
             )
-            .execute()
+            .count()
         )
-        return len(list(search_commands))
 
     def _search_todays(self, condition):
         if self.prioritize_todays_release:
@@ -1511,6 +1793,36 @@ class Arr:
         except Exception as e:
             self.logger.error(e, exc_info=sys.exc_info())
 
+    def delete_from_queue_bulk(
+        self, ids: list[int], remove_from_client: bool = True, blacklist: bool = True
+    ) -> None:
+        if not ids:
+            return
+        params = {
+            "removeFromClient": remove_from_client,
+            "blocklist": blacklist,
+            "blacklist": blacklist,
+        }
+        try:
+            # Sent without pyarr, which does not check the status of responses without a body.
+            response = self.session.delete(
+                f"{self.uri}/api/v3/queue/bulk",
+                params=params,
+                json={"ids": ids},
+                headers={"X-Api-Key": self.apikey},
+                timeout=30,
+            )
+            response.raise_for_status()
+        except Exception as e:
+            self.logger.warning("Bulk queue removal failed, removing one by one: %s", e)
+
+            def delete(id_: int) -> None:
+                with contextlib.suppress(Exception):
+                    self.delete_from_queue(id_, remove_from_client, blacklist)
+
+            self.engine.run(functools.partial(delete, id_) for id_ in ids)
+        self.queue_snapshot.invalidate()
+
     def delete_from_queue(self, id_, remove_from_client=True, blacklist=True):
         params = {
             "removeFromClient": remove_from_client,
@@ -1519,6 +1831,7 @@ class Arr:
         }
         path = f"/api/v3/queue/{id_}"
         res = self.client.request_del(path, params=params)
+        self.queue_snapshot.invalidate()
         return res
 
     def file_is_probeable(self, file: pathlib.Path) -> bool:
@@ -1531,9 +1844,11 @@ class Arr:
             if file.is_dir():
                 self.logger.trace("Not Probeable: File is a directory: %s", file)
                 return False
-            output = ffmpeg.probe(
-                str(file.absolute()), cmd=self.manager.qbit_manager.ffprobe_downloader.probe_path
-            )
+            with self._release_torrent_state():
+                output = ffmpeg.probe(
+                    str(file.absolute()),
+                    cmd=self.manager.qbit_manager.ffprobe_downloader.probe_path,
+                )
             if not output:
                 self.logger.trace("Not Probeable: Probe returned no output: %s", file)
                 return False
@@ -1654,7 +1969,12 @@ class Arr:
                     request_tag,
                     active_commands,
                 )
-                if not bypass_limit and active_commands >= self.search_command_limit:
+                # Entries joining a pending batch do not need a command slot of their own.
+                if (
+                    not bypass_limit
+                    and not self.search_batch
+                    and active_commands >= self.search_command_limit
+                ):
                     self.logger.trace(
                         "%sIdle: Too many commands in queue: %s | "
                         "S%02dE%03d | "
@@ -1668,17 +1988,14 @@ class Arr:
                         file_model.AirDateUtc,
                     )
                     return False
-                self.persistent_queue.insert(
-                    EntryId=file_model.SeriesId
-                ).on_conflict_ignore().execute()
-                self.model_queue.insert(
-                    Completed=False,
-                    EntryId=file_model.EntryId,
-                ).on_conflict_replace().execute()
-                if file_model.EntryId not in self.queue_file_ids:
+                if file_model.EntryId in self.queue_file_ids:
+                    self._mark_searched(file_model, file_model.SeriesId)
+                elif bypass_limit:
                     self.client.post_command("EpisodeSearch", episodeIds=[file_model.EntryId])
-                file_model.Searched = True
-                file_model.save()
+                    self.search_slots.posted()
+                    self._mark_searched(file_model, file_model.SeriesId)
+                else:
+                    self._add_to_search_batch(file_model, file_model.SeriesId)
                 self.logger.hnotice(
                     "%sSearching for: %s | S%02dE%03d | %s | [id=%s|AirDateUTC=%s]",
                     request_tag,
@@ -1714,6 +2031,7 @@ class Arr:
                     EntryId=file_model.EntryId,
                 ).on_conflict_replace().execute()
                 self.client.post_command(self.search_api_command, seriesId=file_model.EntryId)
+                self.search_slots.posted()
                 file_model.Searched = True
                 file_model.save()
                 self.logger.hnotice(
@@ -1754,7 +2072,12 @@ class Arr:
                 request_tag,
                 active_commands,
             )
-            if not bypass_limit and active_commands >= self.search_command_limit:
+            # Entries joining a pending batch do not need a command slot of their own.
+            if (
+                not bypass_limit
+                and not self.search_batch
+                and active_commands >= self.search_command_limit
+            ):
                 self.logger.trace(
                     "%sSkipping: Too many in queue: %s (%s) [tmdbId=%s|id=%s]",
                     request_tag,
@@ -1764,16 +2087,14 @@ class Arr:
                     file_model.EntryId,
                 )
                 return False
-            self.persistent_queue.insert(EntryId=file_model.EntryId).on_conflict_ignore().execute()
-
-            self.model_queue.insert(
-                Completed=False,
-                EntryId=file_model.EntryId,
-            ).on_conflict_replace().execute()
-            if file_model.EntryId not in self.queue_file_ids:
+            if file_model.EntryId in self.queue_file_ids:
+                self._mark_searched(file_model, file_model.EntryId)
+            elif bypass_limit:
                 self.client.post_command("MoviesSearch", movieIds=[file_model.EntryId])
-            file_model.Searched = True
-            file_model.save()
+                self.search_slots.posted()
+                self._mark_searched(file_model, file_model.EntryId)
+            else:
+                self._add_to_search_batch(file_model, file_model.EntryId)
             self.logger.hnotice(
                 "%sSearching for: %s (%s) [tmdbId=%s|id=%s]",
                 request_tag,
@@ -1784,6 +2105,61 @@ class Arr:
             )
             return True
 
+    def _mark_searched(
+        self, file_model: EpisodeFilesModel | MoviesFilesModel, persistent_id: int
+    ) -> None:
+        self.persistent_queue.insert(EntryId=persistent_id).on_conflict_ignore().execute()
+        self.model_queue.insert(
+            Completed=False,
+            EntryId=file_model.EntryId,
+        ).on_conflict_replace().execute()
+        file_model.Searched = True
+        file_model.save()
+
+    def _add_to_search_batch(
+        self, file_model: EpisodeFilesModel | MoviesFilesModel, persistent_id: int
+    ) -> None:
+        if any(entry.EntryId == file_model.EntryId for entry, _ in self.search_batch):
+            return
+        self.search_batch.append((file_model, persistent_id))
+        if len(self.search_batch) >= self.search_batch_size:
+            self.post_search_batch()
+
+    def post_search_batch(self) -> None:
+        """Searches for every entry in the pending batch with a single command.
+
+        Entries are only marked as searched once the Arr instance accepts the
+        command, if it fails they are left to be picked up again.
+        """
+        if not self.search_batch:
+            return
+        batch, self.search_batch = self.search_batch, []
+        ids = [file_model.EntryId for file_model, _ in batch]
+        if self.type == "sonarr":
+            data = {"name": "EpisodeSearch", "episodeIds": ids}
+        else:
+            data = {"name": "MoviesSearch", "movieIds": ids}
+        try:
+            # Sent without pyarr, which does not check the status of the response.
+            response = self.session.post(
+                f"{self.uri}/api/v3/command",
+                json=data,
+                headers={"X-Api-Key": self.apikey},
+                timeout=30,
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            # Also called from the search loop's exception handlers, where raising
+            # would end the search process.
+            self.logger.warning(
+                "Could not search for %s entries, they will be retried: %s", len(ids), e
+            )
+            return
+        self.search_slots.posted()
+        for file_model, persistent_id in batch:
+            self._mark_searched(file_model, persistent_id)
+        self.logger.debug("Searching for %s entries with one command: %s", len(ids), ids)
+
     def post_command(self, name, **kwargs):
         data = {
             "name": name,
@@ -1798,24 +2174,24 @@ class Arr:
         self._process_paused()
         self._process_errored()
         self._process_file_priority()
+        self._process_torrent_settings()
         self._process_imports()
         self._process_failed()
         self.folder_cleanup()
 
     def process_entries(self, hashes: set[str]) -> tuple[list[tuple[int, str]], set[str]]:
-        payload = [
-            (_id, h.upper()) for h in hashes if (_id := self.cache.get(h.upper())) is not None
-        ]
-        hashes = {h for h in hashes if (_id := self.cache.get(h.upper())) is not None}
+        payload = [(_id, h) for h in hashes if (_id := self.cache.get(h)) is not None]
+        hashes = {h for _, h in payload}
 
         return payload, hashes
 
     def process_torrents(self):
         try:
             try:
-                torrents = self.manager.qbit_manager.client.torrents.info.all(
-                    category=self.category, sort="added_on", reverse=False
-                )
+                self.torrent_feed.refresh()
+                self._refresh_completed_torrents()
+                self._process_arr_events(self.torrent_feed.pop_arr_events())
+                torrents = self.torrent_feed.get_torrents()
                 torrents = [t for t in torrents if hasattr(t, "category")]
                 if not len(torrents):
                     raise DelayLoopException(length=5, type="no_downloads")
@@ -1824,12 +2200,26 @@ class Arr:
                     raise DelayLoopException(length=NO_INTERNET_SLEEP_TIMER, type="internet")
                 if self.manager.qbit_manager.should_delay_torrent_scan:
                     raise DelayLoopException(length=NO_INTERNET_SLEEP_TIMER, type="delay")
+                # The queue is only refreshed once the Arr instance is known to be up.
                 self.api_calls()
                 self.refresh_download_queue()
-                for torrent in torrents:
-                    with contextlib.suppress(qbittorrentapi.exceptions.NotFound404Error):
-                        self._process_single_torrent(torrent)
+                hashes = {t.hash for t in torrents}
+                for h in self.tracker_cache.keys() - hashes:
+                    del self.tracker_cache[h]
+                for h in self.torrent_fingerprints.keys() - hashes:
+                    del self.torrent_fingerprints[h]
+                self._prune_torrent_state(hashes)
+                time_now = time.time()
+                torrents, fingerprints = self._get_changed_torrents(torrents, time_now)
+                self.last_loop_active = bool(torrents)
+                self.manager.qbit_manager.torrent_index.update(torrents, seen=hashes)
+                if self.vectorized_processing:
+                    self._process_torrents_vectorized(torrents)
+                else:
+                    self._for_each_torrent(self._process_single_torrent, torrents)
                 self.process()
+                self._store_fingerprints(torrents, fingerprints, time_now)
+                self._flush_state()
             except NoConnectionrException as e:
                 self.logger.error(e.message)
             except qbittorrentapi.exceptions.APIError as e:
@@ -1848,7 +2238,7 @@ class Arr:
         except DelayLoopException:
             raise
 
-    def _process_single_torrent_failed_cat(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _process_single_torrent_failed_cat(self, torrent: TorrentRecord):
         self.logger.notice(
             "Deleting manually failed torrent: "
             "[Progress: %s%%][Added On: %s]"
@@ -1866,7 +2256,7 @@ class Arr:
         )
         self.delete.add(torrent.hash)
 
-    def _process_single_torrent_recheck_cat(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _process_single_torrent_recheck_cat(self, torrent: TorrentRecord):
         self.logger.notice(
             "Re-checking manually set torrent: "
             "[Progress: %s%%][Added On: %s]"
@@ -1884,7 +2274,7 @@ class Arr:
         )
         self.recheck.add(torrent.hash)
 
-    def _process_single_torrent_ignored(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _process_single_torrent_ignored(self, torrent: TorrentRecord):
         # Do not touch torrents that are currently being ignored.
         self.logger.trace(
             "Skipping torrent: Ignored state | "
@@ -1904,9 +2294,7 @@ class Arr:
         if torrent.state_enum == TorrentStates.QUEUED_DOWNLOAD:
             self.recently_queue[torrent.hash] = time.time()
 
-    def _process_single_torrent_added_to_ignore_cache(
-        self, torrent: qbittorrentapi.TorrentDictionary
-    ):
+    def _process_single_torrent_added_to_ignore_cache(self, torrent: TorrentRecord):
         self.logger.trace(
             "Skipping torrent: Marked for skipping | "
             "[Progress: %s%%][Added On: %s]"
@@ -1923,9 +2311,7 @@ class Arr:
             torrent.hash,
         )
 
-    def _process_single_torrent_queued_upload(
-        self, torrent: qbittorrentapi.TorrentDictionary, leave_alone: bool
-    ):
+    def _process_single_torrent_queued_upload(self, torrent: TorrentRecord, leave_alone: bool):
         if leave_alone or torrent.state_enum == TorrentStates.FORCED_UPLOAD:
             self.logger.trace(
                 "Torrent State: Queued Upload | Allowing Seeding | "
@@ -1960,9 +2346,7 @@ class Arr:
                 torrent.hash,
             )
 
-    def _process_single_torrent_stalled_torrent(
-        self, torrent: qbittorrentapi.TorrentDictionary, extra: str
-    ):
+    def _process_single_torrent_stalled_torrent(self, torrent: TorrentRecord, extra: str):
         # Process torrents who have stalled at this point, only mark for
         # deletion if they have been added more than "IgnoreTorrentsYoungerThan"
         # seconds ago
@@ -2005,7 +2389,7 @@ class Arr:
             )
 
     def _process_single_torrent_percentage_threshold(
-        self, torrent: qbittorrentapi.TorrentDictionary, maximum_eta: int
+        self, torrent: TorrentRecord, maximum_eta: int
     ):
         # Ignore torrents who have reached maximum percentage as long as
         # the last activity is within the MaximumETA set for this category
@@ -2053,7 +2437,7 @@ class Arr:
             )
             return
 
-    def _process_single_torrent_paused(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _process_single_torrent_paused(self, torrent: TorrentRecord):
         self.timed_ignore_cache.add(torrent.hash)
         self.resume.add(torrent.hash)
         self.logger.debug(
@@ -2072,9 +2456,7 @@ class Arr:
             torrent.hash,
         )
 
-    def _process_single_torrent_already_sent_to_scan(
-        self, torrent: qbittorrentapi.TorrentDictionary
-    ):
+    def _process_single_torrent_already_sent_to_scan(self, torrent: TorrentRecord):
         self.logger.trace(
             "Skipping torrent: Already sent for import | "
             "[Progress: %s%%][Added On: %s]"
@@ -2091,7 +2473,7 @@ class Arr:
             torrent.hash,
         )
 
-    def _process_single_torrent_errored(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _process_single_torrent_errored(self, torrent: TorrentRecord):
         self.logger.trace(
             "Rechecking Erroed torrent: "
             "[Progress: %s%%][Added On: %s]"
@@ -2110,7 +2492,7 @@ class Arr:
         self.recheck.add(torrent.hash)
 
     def _process_single_torrent_fully_completed_torrent(
-        self, torrent: qbittorrentapi.TorrentDictionary, leave_alone: bool
+        self, torrent: TorrentRecord, leave_alone: bool
     ):
         if leave_alone or torrent.state_enum == TorrentStates.FORCED_UPLOAD:
             self.logger.trace(
@@ -2147,7 +2529,7 @@ class Arr:
             self.pause.add(torrent.hash)
             self.import_torrents.append(torrent)
 
-    def _process_single_torrent_missing_files(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _process_single_torrent_missing_files(self, torrent: TorrentRecord):
         # Sometimes Sonarr/Radarr does not automatically remove the
         # torrent for some reason,
         # this ensures that we can safely remove it if the client is reporting
@@ -2170,9 +2552,7 @@ class Arr:
         # We do not want to blacklist these!!
         self.remove_from_qbit.add(torrent.hash)
 
-    def _process_single_torrent_uploading(
-        self, torrent: qbittorrentapi.TorrentDictionary, leave_alone: bool
-    ):
+    def _process_single_torrent_uploading(self, torrent: TorrentRecord, leave_alone: bool):
         if leave_alone or torrent.state_enum == TorrentStates.FORCED_UPLOAD:
             self.logger.trace(
                 "Torrent State: Queued Upload | Allowing Seeding | "
@@ -2207,9 +2587,7 @@ class Arr:
             )
             self.pause.add(torrent.hash)
 
-    def _process_single_torrent_already_cleaned_up(
-        self, torrent: qbittorrentapi.TorrentDictionary
-    ):
+    def _process_single_torrent_already_cleaned_up(self, torrent: TorrentRecord):
         self.logger.trace(
             "Skipping file check: Already been cleaned up | "
             "[Progress: %s%%][Added On: %s]"
@@ -2226,7 +2604,7 @@ class Arr:
             torrent.hash,
         )
 
-    def _process_single_torrent_delete_slow(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _process_single_torrent_delete_slow(self, torrent: TorrentRecord):
         self.logger.trace(
             "Deleting slow torrent: "
             "[Progress: %s%%][Added On: %s]"
@@ -2244,64 +2622,109 @@ class Arr:
         )
         self.delete.add(torrent.hash)
 
+    def _get_file_verdict(self, file_name: str) -> tuple[str, str] | None:
+        """Returns the reason and matched term if the file should not be downloaded."""
+        file_path = pathlib.Path(file_name)
+        # A folder within the folder tree matched the terms
+        # in FolderExclusionRegex, mark it for exclusion.
+        if self.folder_exclusion_regex and any(
+            self.folder_exclusion_regex_re.search(p.name.lower())
+            for p in file_path.parents
+            if (folder_match := p.name)
+        ):
+            return "Parent", folder_match
+        # A file matched and entry in FileNameExclusionRegex, mark it for
+        # exclusion.
+        elif self.file_name_exclusion_regex and (
+            (match := self.file_name_exclusion_regex_re.search(file_path.name)) and match.group()
+        ):
+            return "Name", match.group()
+        elif (
+            self.file_extension_allowlist
+            and file_path.suffix.lower() not in self.file_extension_allowlist
+        ):
+            return "Extension", file_path.suffix
+        return None
+
+    def _load_files_db(self, model: type[TorrentFilesModel]) -> None:
+        # Files matched against a filter configuration that is no longer in use.
+        model.delete().where(model.FilterHash != self.file_filter_hash).execute()
+        self.files_db_hashes = {h for h, in model.select(model.Hash).tuples()}
+
+    @property
+    def model_torrent_files(self) -> type[TorrentFilesModel]:
+        return self.torrent_files_db.get()
+
+    def _get_torrent_files(
+        self, torrent: TorrentRecord
+    ) -> list[tuple[int, str, int, tuple[str, str] | None]]:
+        """Returns the id, name, priority and verdict of every file in the torrent.
+
+        The file layout of a torrent does not change once its metadata has been
+        downloaded, so the files and their verdicts are persisted per hash and
+        filter configuration to avoid fetching and matching them again.
+
+        Priorities can change at any time and are never cached. qBit only counts
+        wanted files in `size`, so the files are fetched again for their priority
+        when it is smaller than `total_size`, i.e. when some are set to "Don't download".
+        """
+        entry = self.model_torrent_files.get_or_none(
+            (self.model_torrent_files.Hash == torrent.hash)
+            & (self.model_torrent_files.FilterHash == self.file_filter_hash)
+        )
+        if entry is not None:
+            # Entries written by older versions also hold the priority, which is ignored.
+            layout = [
+                (id_, name, tuple(verdict) if verdict else None)
+                for id_, name, *_, verdict in json.loads(entry.Files)
+            ]
+            priorities = {}
+            if torrent.size < torrent.total_size:
+                with self._release_torrent_state():
+                    files = self.manager.qbit.torrents_files(torrent_hash=torrent.hash)
+                priorities = {file.id: file.priority for file in files}
+            return [(id_, name, priorities.get(id_, 1), verdict) for id_, name, verdict in layout]
+        with self._release_torrent_state():
+            files = self.manager.qbit.torrents_files(torrent_hash=torrent.hash)
+        files = [
+            (file.id, file.name, file.priority, self._get_file_verdict(file.name))
+            for file in files
+        ]
+        # Torrents without metadata have no files yet, don't cache those.
+        if files:
+            layout = [(id_, name, verdict) for id_, name, _, verdict in files]
+            self.model_torrent_files.insert(
+                Hash=torrent.hash, FilterHash=self.file_filter_hash, Files=json.dumps(layout)
+            ).on_conflict_replace().execute()
+            self.files_db_hashes.add(torrent.hash)
+        return files
+
     def _process_single_torrent_process_files(
-        self, torrent: qbittorrentapi.TorrentDictionary, special_case: bool = False
+        self, torrent: TorrentRecord, special_case: bool = False
     ):
         _remove_files = set()
-        total = len(torrent.files)
+        files = self._get_torrent_files(torrent)
+        total = len(files)
         if total == 0:
             return
         elif special_case:
             self.special_casing_file_check.add(torrent.hash)
-        for file in torrent.files:
-            file_path = pathlib.Path(file.name)
+        for file_id, file_name, priority, verdict in files:
             # Acknowledge files that already been marked as "Don't download"
-            if file.priority == 0:
+            if priority == 0:
                 total -= 1
                 continue
-            # A folder within the folder tree matched the terms
-            # in FolderExclusionRegex, mark it for exclusion.
-            if self.folder_exclusion_regex and any(
-                self.folder_exclusion_regex_re.search(p.name.lower())
-                for p in file_path.parents
-                if (folder_match := p.name)
-            ):
-                self.logger.debug(
-                    "Removing File: Not allowed | Parent: %s  | %s (%s) | %s ",
-                    folder_match,
-                    torrent.name,
-                    torrent.hash,
-                    file.name,
-                )
-                _remove_files.add(file.id)
-                total -= 1
-            # A file matched and entry in FileNameExclusionRegex, mark it for
-            # exclusion.
-            elif self.file_name_exclusion_regex and (
-                (match := self.file_name_exclusion_regex_re.search(file_path.name))
-                and match.group()
-            ):
-                self.logger.debug(
-                    "Removing File: Not allowed | Name: %s  | %s (%s) | %s ",
-                    match.group(),
-                    torrent.name,
-                    torrent.hash,
-                    file.name,
-                )
-                _remove_files.add(file.id)
-                total -= 1
-            elif (
-                self.file_extension_allowlist
-                and file_path.suffix.lower() not in self.file_extension_allowlist
-            ):
+            if verdict is not None:
+                reason, match = verdict
                 self.logger.debug(
-                    "Removing File: Not allowed | Extension: %s  | %s (%s) | %s ",
-                    file_path.suffix,
+                    "Removing File: Not allowed | %s: %s  | %s (%s) | %s ",
+                    reason,
+                    match,
                     torrent.name,
                     torrent.hash,
-                    file.name,
+                    file_name,
                 )
-                _remove_files.add(file.id)
+                _remove_files.add(file_id)
                 total -= 1
             # If all files in the torrent are marked for exclusion then delete the
             # torrent.
@@ -2332,7 +2755,7 @@ class Arr:
 
         self.cleaned_torrents.add(torrent.hash)
 
-    def _process_single_torrent_unprocessed(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _process_single_torrent_unprocessed(self, torrent: TorrentRecord):
         self.logger.trace(
             "Skipping torrent: Unresolved state: "
             "[Progress: %s%%][Added On: %s]"
@@ -2349,10 +2772,21 @@ class Arr:
             torrent.hash,
         )
 
-    def _get_torrent_important_trackers(
-        self, torrent: qbittorrentapi.TorrentDictionary
-    ) -> tuple[set[str], set[str]]:
-        current_trackers = {i.url for i in torrent.trackers}
+    def _get_torrent_trackers(
+        self, torrent: TorrentRecord, refresh: bool = False
+    ) -> qbittorrentapi.TrackersList:
+        # The tracker list is only fetched again if qBit reports a change to the trackers
+        # of the torrent, or if it is explicitly requested.
+        key = (torrent.get("trackers_count"), torrent.get("tracker"))
+        if not refresh and (cached := self.tracker_cache.get(torrent.hash)) and cached[0] == key:
+            return cached[1]
+        with self._release_torrent_state():
+            trackers = self.manager.qbit.torrents_trackers(torrent_hash=torrent.hash)
+        self.tracker_cache[torrent.hash] = (key, trackers)
+        return trackers
+
+    def _get_torrent_important_trackers(self, torrent: TorrentRecord) -> tuple[set[str], set[str]]:
+        current_trackers = {i.url for i in self._get_torrent_trackers(torrent)}
         monitored_trackers = self._monitored_tracker_urls.intersection(current_trackers)
         need_to_be_added = self._add_trackers_if_missing.difference(current_trackers)
         monitored_trackers = monitored_trackers.union(need_to_be_added)
@@ -2377,7 +2811,7 @@ class Arr:
             max_item = {}
         return max_item, set(itertools.chain.from_iterable(_list_of_tags))
 
-    def _get_torrent_limit_meta(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _get_torrent_limit_meta(self, torrent: TorrentRecord):
         _, monitored_trackers = self._get_torrent_important_trackers(torrent)
         most_important_tracker, unique_tags = self._get_most_important_tracker_and_tags(
             monitored_trackers, {}
@@ -2429,46 +2863,61 @@ class Arr:
         }
         return data_settings, data_torrent
 
-    def _should_leave_alone(self, torrent: qbittorrentapi.TorrentDictionary) -> tuple[bool, int]:
+    def _get_seeding_limits(self, torrent: TorrentRecord) -> tuple[float, int, bool, int]:
+        """Returns the ratio limit, seeding time limit, super seeding and maximum ETA.
+
+        The values of the most important tracker win over the global ones, the
+        ratio and seeding time limits set on the torrent are used if they are higher.
+        """
+        data_settings, data_torrent = self._get_torrent_limit_meta(torrent)
+        return (
+            max(data_settings.get("ratio_limit", -5), data_torrent.get("ratio_limit", -5)),
+            max(
+                data_settings.get("seeding_time_limit", -5),
+                data_torrent.get("seeding_time_limit", -5),
+            ),
+            data_settings.get("super_seeding", False) or data_torrent.get("super_seeding", False),
+            data_settings.get("max_eta", self.maximum_eta),
+        )
+
+    def _should_leave_alone(self, torrent: TorrentRecord) -> tuple[bool, int]:
         return_value = True
         if torrent.super_seeding or torrent.state_enum == TorrentStates.FORCED_UPLOAD:
             return return_value, -1  # Do not touch super seeding torrents.
-        data_settings, data_torrent = self._get_torrent_limit_meta(torrent)
-        self.logger.trace("Config Settings for torrent [%s]: %r", torrent.name, data_settings)
-        self.logger.trace("Torrent Settings for torrent [%s]: %r", torrent.name, data_torrent)
+        limits = self._get_seeding_limits(torrent)
+        self.logger.trace("Seeding limits for torrent [%s]: %r", torrent.name, limits)
         self.logger.trace("%r", torrent)
-
-        ratio_limit_dat = data_settings.get("ratio_limit", -5)
-        ratio_limit_tor = data_torrent.get("ratio_limit", -5)
-        seeding_time_limit_dat = data_settings.get("seeding_time_limit", -5)
-        seeding_time_limit_tor = data_torrent.get("seeding_time_limit", -5)
-
-        seeding_time_limit = max(seeding_time_limit_dat, seeding_time_limit_tor)
-        ratio_limit = max(ratio_limit_dat, ratio_limit_tor)
+        ratio_limit, seeding_time_limit, super_seeding, max_eta = limits
 
         if torrent.ratio >= ratio_limit:
             return_value = False  # Seeding ratio met - Can be cleaned up.
         if torrent.seeding_time >= seeding_time_limit:
             return_value = False  # Seeding time met - Can be cleaned up.
-        if data_settings.get("super_seeding", False) or data_torrent.get("super_seeding", False):
+        if super_seeding:
             return_value = True
         if return_value is True and "qbitrr-allowed_seeding" not in torrent.tags:
-            torrent.add_tags(tags=["qbitrr-allowed_seeding"])
+            self.tags_to_add["qbitrr-allowed_seeding"].add(torrent.hash)
         elif return_value is False and "qbitrr-allowed_seeding" in torrent.tags:
-            torrent.remove_tags(tags=["qbitrr-allowed_seeding"])
-        return return_value, data_settings.get(
-            "max_eta", self.maximum_eta
-        )  # Seeding is not complete needs more time
+            self.tags_to_remove["qbitrr-allowed_seeding"].add(torrent.hash)
+        return return_value, max_eta  # Seeding is not complete needs more time
 
-    def _process_single_torrent_trackers(self, torrent: qbittorrentapi.TorrentDictionary):
+    def _process_single_torrent_trackers(self, torrent: TorrentRecord):
         if torrent.hash in self.tracker_delay:
             return
         self.tracker_delay.add(torrent.hash)
         _remove_urls = set()
+        # Tracker messages are not part of the sync data, so they have to be fetched
+        # again (at most once per tracker delay) if dead trackers should be removed.
+        trackers = self._get_torrent_trackers(torrent, refresh=self.remove_dead_trackers)
         need_to_be_added, monitored_trackers = self._get_torrent_important_trackers(torrent)
         if need_to_be_added:
-            torrent.add_trackers(need_to_be_added)
-        for tracker in torrent.trackers:
+            with self._release_torrent_state():
+                self.manager.qbit.torrents_add_trackers(
+                    torrent_hash=torrent.hash, urls=need_to_be_added
+                )
+            self.tracker_cache.pop(torrent.hash, None)
+            self._request_torrent_sync()
+        for tracker in trackers:
             if (
                 self.remove_dead_trackers
                 and (
@@ -2483,139 +2932,62 @@ class Arr:
                 torrent.hash,
                 _remove_urls,
             )
-            with contextlib.suppress(qbittorrentapi.exceptions.Conflict409Error):
-                torrent.remove_trackers(_remove_urls)
+            with self._release_torrent_state(), contextlib.suppress(
+                qbittorrentapi.exceptions.Conflict409Error
+            ):
+                self.manager.qbit.torrents_remove_trackers(
+                    torrent_hash=torrent.hash, urls=_remove_urls
+                )
+            self.tracker_cache.pop(torrent.hash, None)
+            self._request_torrent_sync()
         most_important_tracker, unique_tags = self._get_most_important_tracker_and_tags(
             monitored_trackers, _remove_urls
         )
-        if monitored_trackers and most_important_tracker:
-            # Only use globals if there is not a configured equivalent value on the
-            # highest priority tracker
-            data = {
-                "ratio_limit": r
-                if (
-                    r := most_important_tracker.get(
-                        "MaxUploadRatio", self.seeding_mode_global_max_upload_ratio
-                    )
-                )
-                > 0
-                else None,
-                "seeding_time_limit": r
-                if (
-                    r := most_important_tracker.get(
-                        "MaxSeedingTime", self.seeding_mode_global_max_seeding_time
-                    )
-                )
-                > 0
-                else None,
-            }
-            if any(r is not None for r in data):
-                if (
-                    (_l1 := data.get("seeding_time_limit"))
-                    and _l1 > 0
-                    and torrent.seeding_time_limit != data.get("seeding_time_limit")
-                ):
-                    data.pop("seeding_time_limit")
-                if (
-                    (_l2 := data.get("ratio_limit"))
-                    and _l2 > 0
-                    and torrent.seeding_time_limit != data.get("ratio_limit")
-                ):
-                    data.pop("ratio_limit")
-
-                if not _l1:
-                    data["seeding_time_limit"] = None
-                elif _l1 < 0:
-                    data["seeding_time_limit"] = None
-                if not _l2:
-                    data["ratio_limit"] = None
-                elif _l2 < 0:
-                    data["ratio_limit"] = None
-
-                if any(v is not None for v in data.values()):
-                    if any(v is not None for v in data.values()):
-                        if data:
-                            with contextlib.suppress(Exception):
-                                torrent.set_share_limits(**data)
-            if (
-                r := most_important_tracker.get(
-                    "DownloadRateLimit", self.seeding_mode_global_download_limit
-                )
-                != 0
-                and torrent.dl_limit != r
-            ):
-                torrent.set_download_limit(limit=r)
-            elif r < 0:
-                torrent.set_upload_limit(limit=-1)
-            if (
-                r := most_important_tracker.get(
-                    "UploadRateLimit", self.seeding_mode_global_upload_limit
-                )
-                != 0
-                and torrent.up_limit != r
-            ):
-                torrent.set_upload_limit(limit=r)
-            elif r < 0:
-                torrent.set_upload_limit(limit=-1)
+        # Only use globals if there is not a configured equivalent value on the
+        # highest priority tracker
+        ratio_limit = most_important_tracker.get(
+            "MaxUploadRatio", self.seeding_mode_global_max_upload_ratio
+        )
+        seeding_time_limit = most_important_tracker.get(
+            "MaxSeedingTime", self.seeding_mode_global_max_seeding_time
+        )
+        download_limit = most_important_tracker.get(
+            "DownloadRateLimit", self.seeding_mode_global_download_limit
+        )
+        upload_limit = most_important_tracker.get(
+            "UploadRateLimit", self.seeding_mode_global_upload_limit
+        )
+        # Only queue the changes, torrents that need the same values are updated
+        # together with a single call in `_process_torrent_settings`.
+        if ratio_limit > 0 or seeding_time_limit > 0:
+            # qBit requires both limits to be set at once, keep the current value of
+            # the one that is not configured.
+            ratio_limit = round(ratio_limit, 2) if ratio_limit > 0 else torrent.ratio_limit
+            if seeding_time_limit <= 0:
+                seeding_time_limit = torrent.seeding_time_limit
             if (
-                r := most_important_tracker.get("SuperSeedMode", False)
-                and torrent.super_seeding != r
+                round(torrent.ratio_limit, 2) != ratio_limit
+                or torrent.seeding_time_limit != seeding_time_limit
             ):
-                torrent.set_super_seeding(enabled=r)
-
-        else:
-            data = {
-                "ratio_limit": r if (r := self.seeding_mode_global_max_upload_ratio) > 0 else None,
-                "seeding_time_limit": r
-                if (r := self.seeding_mode_global_max_seeding_time) > 0
-                else None,
-            }
-            if any(r is not None for r in data):
-                if (
-                    (_l1 := data.get("seeding_time_limit"))
-                    and _l1 > 0
-                    and torrent.seeding_time_limit != data.get("seeding_time_limit")
-                ):
-                    data.pop("seeding_time_limit")
-                if (
-                    (_l2 := data.get("ratio_limit"))
-                    and _l2 > 0
-                    and torrent.seeding_time_limit != data.get("ratio_limit")
-                ):
-                    data.pop("ratio_limit")
-                if not _l1:
-                    data["seeding_time_limit"] = None
-                elif _l1 < 0:
-                    data["seeding_time_limit"] = None
-                if not _l2:
-                    data["ratio_limit"] = None
-                elif _l2 < 0:
-                    data["ratio_limit"] = None
-                if any(v is not None for v in data.values()):
-                    if data:
-                        with contextlib.suppress(Exception):
-                            torrent.set_share_limits(**data)
-
-            if r := self.seeding_mode_global_download_limit != 0 and torrent.dl_limit != r:
-                torrent.set_download_limit(limit=r)
-            elif r < 0:
-                torrent.set_download_limit(limit=-1)
-            if r := self.seeding_mode_global_upload_limit != 0 and torrent.up_limit != r:
-                torrent.set_upload_limit(limit=r)
-            elif r < 0:
-                torrent.set_upload_limit(limit=-1)
+                self.share_limits[(ratio_limit, seeding_time_limit)].add(torrent.hash)
+        if download_limit > 0 and torrent.dl_limit != download_limit:
+            self.download_limits[download_limit].add(torrent.hash)
+        elif download_limit < 0 and torrent.dl_limit > 0:
+            self.download_limits[-1].add(torrent.hash)
+        if upload_limit > 0 and torrent.up_limit != upload_limit:
+            self.upload_limits[upload_limit].add(torrent.hash)
+        elif upload_limit < 0 and torrent.up_limit > 0:
+            self.upload_limits[-1].add(torrent.hash)
+        if most_important_tracker.get("SuperSeedMode", False) and not torrent.super_seeding:
+            self.super_seed.add(torrent.hash)
 
         if unique_tags:
             current_tags = set(torrent.tags.split(", "))
-            add_tags = unique_tags.difference(current_tags)
-            if add_tags:
-                torrent.add_tags(add_tags)
+            for tag in unique_tags.difference(current_tags):
+                self.tags_to_add[tag].add(torrent.hash)
 
-    def _process_single_torrent(self, torrent: qbittorrentapi.TorrentDictionary):
-        if torrent.category != RECHECK_CATEGORY:
-            self.manager.qbit_manager.cache[torrent.hash] = torrent.category
+    def _process_single_torrent(self, torrent: TorrentRecord):
         self._process_single_torrent_trackers(torrent)
-        self.manager.qbit_manager.name_cache[torrent.hash] = torrent.name
         time_now = time.time()
         leave_alone, _tracker_max_eta = self._should_leave_alone(torrent)
         self.logger.trace(
@@ -2682,7 +3054,7 @@ class Arr:
             and torrent.state_enum != TorrentStates.PAUSED_UPLOAD
             and self.is_complete_state(torrent)
             and torrent.content_path
-            and torrent.completion_on < time_now - 60
+            and (torrent.completion_on < time_now - 60 or torrent.hash in self.completed_hooks)
         ):
             self._process_single_torrent_fully_completed_torrent(torrent, leave_alone)
         elif torrent.state_enum == TorrentStates.MISSING_FILES:
@@ -2727,31 +3099,370 @@ class Arr:
         else:
             self._process_single_torrent_unprocessed(torrent)
 
+    def _refresh_completed_torrents(self) -> None:
+        """Fetch the latest data of the torrents qBit reported as completed.
+
+        These skip the grace period after completion so they are imported in
+        this loop rather than a later one.
+        """
+        self.completed_hooks = (
+            self.torrent_feed.pop_completed() & self.torrent_feed.torrents.keys()
+        )
+        if not self.completed_hooks:
+            return
+        self.logger.debug("Completed torrents reported by qBit: %s", self.completed_hooks)
+        torrents = self.manager.qbit.torrents_info(torrent_hashes=self.completed_hooks)
+        self.torrent_feed.apply(False, {t["hash"]: dict(t) for t in torrents}, [])
+
+    def _torrent_fingerprint(self, torrent: TorrentRecord) -> tuple:
+        # Counters that always tick (seeding time, last activity) are left out on
+        # purpose, the thresholds they are compared against are covered by the deadline.
+        return (
+            torrent.state,
+            torrent.category,
+            torrent.name,
+            torrent.progress,
+            torrent.amount_left,
+            torrent.availability,
+            torrent.eta,
+            torrent.ratio,
+            torrent.tags,
+            torrent.content_path,
+            torrent.completion_on,
+            torrent.ratio_limit,
+            torrent.seeding_time_limit,
+            torrent.dl_limit,
+            torrent.up_limit,
+            torrent.super_seeding,
+            torrent.tracker,
+            torrent.trackers_count,
+            torrent.hash in self.cleaned_torrents,
+            torrent.hash in self.special_casing_file_check,
+            torrent.hash in self.timed_ignore_cache,
+            torrent.hash in self.sent_to_scan_hashes,
+            torrent.hash in self.completed_hooks,
+        )
+
+    def _torrent_deadline(self, torrent: TorrentRecord, time_now: float) -> float:
+        """Returns the next time the verdict for the torrent can change on its own.
+
+        The limits are resolved the same way `_should_leave_alone` does, reaching the
+        ratio limit needs an upload which changes the fingerprint, so it has no deadline.
+        """
+        # Re-evaluate at least as often as trackers are processed.
+        deadlines = [time_now + self.tracker_delay.age]
+        queued_on = self.recently_queue.get(torrent.hash, torrent.added_on)
+        candidates = [queued_on + self.ignore_torrents_younger_than, torrent.completion_on + 60]
+        if not torrent.super_seeding and torrent.state_enum != TorrentStates.FORCED_UPLOAD:
+            _, seeding_time_limit, _, max_eta = self._get_seeding_limits(torrent)
+            if max_eta > 0:
+                candidates.append(torrent.last_activity + max_eta)
+            if seeding_time_limit > 0:
+                candidates.append(time_now + seeding_time_limit - torrent.seeding_time)
+        for deadline in candidates:
+            if deadline > time_now:
+                deadlines.append(deadline)
+        return min(deadlines)
+
+    def _get_changed_torrents(
+        self, torrents: list[TorrentRecord], time_now: float
+    ) -> tuple[list[TorrentRecord], dict[str, tuple]]:
+        """Returns the torrents whose verdict may have changed since the last loop.
+
+        A torrent is skipped if nothing its verdict depends on has changed and no
+        time threshold was crossed since it was last processed. The fingerprints
+        of the returned torrents should only be stored once they were processed.
+        """
+        changed = []
+        fingerprints = {}
+        for torrent in torrents:
+            fingerprint = self._torrent_fingerprint(torrent)
+            previous = self.torrent_fingerprints.get(torrent.hash)
+            if previous is not None and previous[0] == fingerprint and previous[1] > time_now:
+                continue
+            fingerprints[torrent.hash] = fingerprint
+            changed.append(torrent)
+        self.logger.trace(
+            "Processing %s of %s torrents, the rest are unchanged",
+            len(changed),
+            len(torrents),
+        )
+        return changed, fingerprints
+
+    def _store_fingerprints(
+        self, torrents: list[TorrentRecord], fingerprints: dict[str, tuple], time_now: float
+    ) -> None:
+        # The deadlines are only built once the torrents were processed, by then the
+        # tracker lists their limits depend on are cached.
+        for torrent in torrents:
+            self.torrent_fingerprints[torrent.hash] = (
+                fingerprints[torrent.hash],
+                self._torrent_deadline(torrent, time_now),
+            )
+
+    def _for_each_torrent(self, func: Callable, items: Iterable) -> None:
+        """Calls `func` for every item, in parallel when ConcurrentRequests > 1.
+
+        Workers hold `torrent_state_lock` for the whole handler, so the caches
+        and collectors shared by the handlers are only ever used by one thread
+        at a time. It is released around the qBit calls and file probes (see
+        `_release_torrent_state`), which is the part that runs in parallel.
+        """
+
+        def call(item) -> None:
+            with contextlib.suppress(qbittorrentapi.exceptions.NotFound404Error):
+                func(item)
+
+        def call_locked(item) -> None:
+            with self.torrent_state_lock:
+                self.torrent_worker.holds_lock = True
+                try:
+                    call(item)
+                finally:
+                    self.torrent_worker.holds_lock = False
+
+        if self.torrent_workers == 1:
+            for item in items:
+                call(item)
+            return
+        pool = self.torrent_pool.get()
+        futures = [pool.submit(call_locked, item) for item in items]
+        # Wait for every torrent before raising so no handler is still running
+        # when the loop is retried.
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    @contextlib.contextmanager
+    def _release_torrent_state(self) -> Iterator[None]:
+        """Lets the other torrent workers run while this one waits on I/O.
+
+        Nothing read from the shared state before the call may be relied upon
+        after it, the handlers only use it for the torrent they are handling.
+        """
+        if not getattr(self.torrent_worker, "holds_lock", False):
+            yield
+            return
+        self.torrent_state_lock.release()
+        try:
+            yield
+        finally:
+            self.torrent_state_lock.acquire()
+
+    def _process_torrents_vectorized(self, torrents: list[TorrentRecord]):
+        """Equivalent of calling `_process_single_torrent` for every torrent.
+
+        All torrents are classified at once, handlers are only called for the
+        torrents that need something done to them.
+        """
+        time_now = time.time()
+        snapshot = TorrentSnapshot(torrents, self.recently_queue)
+        categories = [t.category for t in torrents]
+        kwargs = dict(
+            failed_category=snapshot.mask(c == FAILED_CATEGORY for c in categories),
+            recheck_category=snapshot.mask(c == RECHECK_CATEGORY for c in categories),
+            special_file_check=snapshot.member_of(self.special_casing_file_check),
+            cleaned=snapshot.member_of(self.cleaned_torrents),
+            ignore_cache=snapshot.member_of(self.timed_ignore_cache),
+            sent_to_scan=snapshot.member_of(self.sent_to_scan_hashes),
+            completed_hook=snapshot.member_of(self.completed_hooks),
+            maximum_eta=np.zeros(len(snapshot), dtype=np.int64),
+            time_now=time_now,
+            maximum_deletable_percentage=self.maximum_deletable_percentage,
+            ignore_torrents_younger_than=self.ignore_torrents_younger_than,
+            do_not_remove_slow=self.do_not_remove_slow,
+        )
+        buckets = classify(snapshot, **kwargs)
+        # The maximum ETA depends on the trackers of each torrent, only resolve it
+        # for the downloads that could be slow and classify again.
+        leave_alone = {}
+        if not self.do_not_remove_slow:
+            candidates = np.flatnonzero(
+                np.isin(buckets, [Bucket.UNAVAILABLE, Bucket.CLEANED_UP, Bucket.FILE_CHECK])
+                & (snapshot.eta > 0)
+            )
+            for i in candidates:
+                leave_alone[i] = self._should_leave_alone(torrents[i])
+                kwargs["maximum_eta"][i] = leave_alone[i][1]
+            if len(candidates):
+                buckets = classify(snapshot, **kwargs)
+
+        def process(i: int) -> None:
+            torrent, bucket = torrents[i], buckets[i]
+            self._process_single_torrent_trackers(torrent)
+            if bucket in LOG_ONLY_BUCKETS and not self.is_complete_state(torrent):
+                return
+            if i not in leave_alone:
+                leave_alone[i] = self._should_leave_alone(torrent)
+            if bucket not in LOG_ONLY_BUCKETS:
+                self._process_single_torrent_bucket(torrent, Bucket(bucket), *leave_alone[i])
+
+        self._for_each_torrent(process, range(len(torrents)))
+
+    def _process_single_torrent_bucket(
+        self,
+        torrent: TorrentRecord,
+        bucket: Bucket,
+        leave_alone: bool,
+        maximum_eta: int,
+    ):
+        if bucket == Bucket.FAILED_CATEGORY:
+            self._process_single_torrent_failed_cat(torrent)
+        elif bucket == Bucket.RECHECK_CATEGORY:
+            self._process_single_torrent_recheck_cat(torrent)
+        elif bucket == Bucket.IGNORED:
+            self._process_single_torrent_ignored(torrent)
+        elif bucket == Bucket.SPECIAL_FILE_CHECK:
+            self._process_single_torrent_process_files(torrent, True)
+        elif bucket == Bucket.QUEUED_UPLOAD:
+            self._process_single_torrent_queued_upload(torrent, leave_alone)
+        elif bucket == Bucket.STALLED:
+            self._process_single_torrent_stalled_torrent(torrent, "Stalled State")
+        elif bucket == Bucket.PERCENTAGE_THRESHOLD:
+            self._process_single_torrent_percentage_threshold(torrent, maximum_eta)
+        elif bucket == Bucket.PAUSED:
+            self._process_single_torrent_paused(torrent)
+        elif bucket == Bucket.ERRORED:
+            self._process_single_torrent_errored(torrent)
+        elif bucket == Bucket.COMPLETED:
+            self._process_single_torrent_fully_completed_torrent(torrent, leave_alone)
+        elif bucket == Bucket.MISSING_FILES:
+            self._process_single_torrent_missing_files(torrent)
+        elif bucket == Bucket.UPLOADING:
+            self._process_single_torrent_uploading(torrent, leave_alone)
+        elif bucket == Bucket.DELETE_SLOW:
+            self._process_single_torrent_delete_slow(torrent)
+        elif bucket == Bucket.UNAVAILABLE:
+            self._process_single_torrent_stalled_torrent(torrent, "Unavailable")
+        elif bucket == Bucket.FILE_CHECK:
+            self._process_single_torrent_process_files(torrent)
+
     def refresh_download_queue(self):
-        if self.type == "sonarr":
-            self.queue = self.get_queue()
-        elif self.type == "radarr":
-            self.queue = self.get_queue()
-        self.cache = {
-            entry["downloadId"]: entry["id"] for entry in self.queue if entry.get("downloadId")
+        queue = self.queue_snapshot.get()
+        if queue is self.queue:
+            # Nothing new since the last refresh, webhook events may have updated
+            # the indexes in the meantime.
+            return
+        self.queue = queue
+        entries = {
+            entry["id"]: (entry.get("downloadId"), entry.get("episodeId"), entry.get("movieId"))
+            for entry in self.queue
+            if "id" in entry
         }
-        if self.type == "sonarr":
-            self.requeue_cache = defaultdict(set)
-            for entry in self.queue:
-                if r := entry.get("episodeId"):
-                    self.requeue_cache[entry["id"]].add(r)
-            self.queue_file_ids = {
-                entry["episodeId"] for entry in self.queue if entry.get("episodeId")
-            }
-        elif self.type == "radarr":
-            self.requeue_cache = {
-                entry["id"]: entry["movieId"] for entry in self.queue if entry.get("movieId")
-            }
-            self.queue_file_ids = {
-                entry["movieId"] for entry in self.queue if entry.get("movieId")
-            }
+        # Only entries that were added, removed or changed touch the indexes.
+        for id_ in self.queue_entries.keys() - entries.keys():
+            self._unindex_queue_entry(id_, *self.queue_entries.pop(id_))
+        for id_, key in entries.items():
+            previous = self.queue_entries.get(id_)
+            if previous == key:
+                continue
+            if previous is not None:
+                self._unindex_queue_entry(id_, *previous)
+            self._index_queue_entry(id_, *key)
+            self.queue_entries[id_] = key
         self._update_bad_queue_items()
 
+    def _index_queue_entry(
+        self, id_: int, download_id: str | None, episode_id: int | None, movie_id: int | None
+    ) -> None:
+        if download_id:
+            hash_ = infohash(download_id)
+            self.queue_ids_by_hash[hash_].add(id_)
+            self.cache[hash_] = id_
+        file_id = episode_id if self.type == "sonarr" else movie_id
+        if file_id:
+            self.requeue_cache[id_] = {file_id} if self.type == "sonarr" else file_id
+            self.queue_file_id_counts[file_id] += 1
+            self.queue_file_ids.add(file_id)
+
+    def _unindex_queue_entry(
+        self, id_: int, download_id: str | None, episode_id: int | None, movie_id: int | None
+    ) -> None:
+        if download_id:
+            hash_ = infohash(download_id)
+            # Season packs have one queue entry per episode, all with the same hash.
+            ids = self.queue_ids_by_hash[hash_]
+            ids.discard(id_)
+            if ids:
+                self.cache[hash_] = next(iter(ids))
+            else:
+                del self.queue_ids_by_hash[hash_]
+                self.cache.pop(hash_, None)
+        file_id = episode_id if self.type == "sonarr" else movie_id
+        if file_id:
+            self.requeue_cache.pop(id_, None)
+            self.queue_file_id_counts[file_id] -= 1
+            if self.queue_file_id_counts[file_id] <= 0:
+                del self.queue_file_id_counts[file_id]
+                self.queue_file_ids.discard(file_id)
+
+    def _process_arr_events(self, events: list[dict]) -> None:
+        """Applies the events the Arr instance sent through the webhook server.
+
+        Imports are applied to the queue indexes and the search database straight
+        away, grabs trigger a queue refresh on this loop. Once events arrive the
+        full queue is only polled every `QUEUE_SWEEP_INTERVAL` seconds to catch
+        anything the events missed, until no event arrives for `ARR_EVENT_WINDOW`
+        seconds.
+        """
+        time_now = time.monotonic()
+        if not events:
+            if self.arr_event_at is not None and time_now - self.arr_event_at >= ARR_EVENT_WINDOW:
+                self.logger.debug(
+                    "No Arr events for %s, polling the queue on every loop",
+                    timedelta(seconds=ARR_EVENT_WINDOW),
+                )
+                self.arr_event_at = None
+                self.queue_snapshot.max_age = LOOP_SLEEP_TIMER
+            return
+        self.arr_event_at = time_now
+        self.queue_snapshot.max_age = QUEUE_SWEEP_INTERVAL
+        imported = set()
+        for event in events:
+            if event["eventType"] == "Grab":
+                self.queue_snapshot.invalidate()
+            elif event["eventType"] in {"Download", "ImportComplete"}:
+                if download_id := event["downloadId"]:
+                    hash_ = infohash(download_id)
+                    for id_ in list(self.queue_ids_by_hash.get(hash_, ())):
+                        self._unindex_queue_entry(id_, *self.queue_entries.pop(id_))
+                imported.update(event["ids"])
+        if imported and self.search_missing:
+            self.register_search_mode()
+            if self.model_queue is not None:
+                self.model_queue.update(Completed=True).where(
+                    self.model_queue.EntryId.in_(list(imported))
+                ).execute()
+        self.logger.debug("Processed %s Arr events", len(events))
+
+    def _fetch_queue(self) -> list[dict]:
+        """Fetches the whole queue, `QUEUE_PAGE_SIZE` records at a time.
+
+        Small pages keep every response fast to render on large queues. Entries
+        can move between pages while paging, duplicates are dropped and anything
+        missed is picked up by the next fetch.
+        """
+        records = {}
+        page = 1
+        while True:
+            res = self.client.request_get(
+                "/api/v3/queue",
+                params={
+                    "page": page,
+                    "pageSize": QUEUE_PAGE_SIZE,
+                    "sortDirection": "ascending",
+                    "sortKey": "timeLeft",
+                },
+            )
+            batch = res.get("records", []) if isinstance(res, dict) else res
+            for entry in batch:
+                records.setdefault(entry.get("id"), entry)
+            total = res.get("totalRecords", 0) if isinstance(res, dict) else 0
+            if len(batch) < QUEUE_PAGE_SIZE or page * QUEUE_PAGE_SIZE >= total:
+                break
+            page += 1
+        return list(records.values())
+
     def get_queue(
         self,
         page=1,
@@ -2780,7 +3491,7 @@ class Arr:
     def _update_bad_queue_items(self):
         if not self.arr_error_codes_to_blocklist:
             return
-        _temp = self.get_queue()
+        _temp = self.queue_snapshot.get()
         _temp = filter(
             lambda x: x.get("status") == "completed"
             and x.get("trackedDownloadState") == "importPending"
@@ -2799,14 +3510,14 @@ class Arr:
                 for _m in m.get("messages", []):
                     if _m in self.arr_error_codes_to_blocklist:
                         _path_filter.add(pathlib.Path(output_path).joinpath(title))
-                        e = entry.get("downloadId")
-                        self.downloads_with_bad_error_message_blocklist.add(e)
+                        if e := entry.get("downloadId"):
+                            self.downloads_with_bad_error_message_blocklist.add(infohash(e))
         if len(_path_filter):
             self.needs_cleanup = True
         self.files_to_explicitly_delete = iter(_path_filter.copy())
 
     def force_grab(self):
-        _temp = self.get_queue()
+        _temp = self.queue_snapshot.get()
         _temp = filter(
             lambda x: x.get("status") == "delay",
             _temp,
@@ -2817,14 +3528,14 @@ class Arr:
                 ids.add(id_)
                 self.logger.notice("Attempting to force grab: %s =  %s", id_, entry.get("title"))
         if ids:
-            with ThreadPoolExecutor(max_workers=16) as executor:
-                executor.map(self._force_grab, ids)
+            self.grab_dispatcher.submit(ids)
 
     def _force_grab(self, id_):
         try:
             path = f"/api/v3/queue/grab/{id_}"
             res = self.client.request_post(path, data={})
             self.logger.trace("Successful Grab: %s", id_)
+            self.queue_snapshot.invalidate()
             return res
         except Exception:
             self.logger.error("Exception when trying to force grab - %s", id_)
@@ -2988,6 +3699,7 @@ class Arr:
                     try:
                         for entry, todays, limit_bypass, series_search in self.db_get_files():
                             if timer < (datetime.now(timezone.utc) - loop_timer):
+                                self.post_search_batch()
                                 self.force_grab()
                                 raise RestartLoopException
                             while (
@@ -3000,6 +3712,7 @@ class Arr:
                                 is False
                             ):
                                 time.sleep(30)
+                        self.post_search_batch()
                         self.search_current_year += self._delta
                         if self.search_in_reverse:
                             if self.search_current_year > stopping_year:
@@ -3018,6 +3731,7 @@ class Arr:
                     except DelayLoopException:
                         raise
                     except ValueError:
+                        self.post_search_batch()
                         self.logger.debug("Loop completed, restarting it.")
                         self.loop_completed = True
                     except qbittorrentapi.exceptions.APIConnectionError as e:
@@ -3059,9 +3773,166 @@ class Arr:
             self.logger.hnotice("Detected Ctrl+C - Terminating process")
             sys.exit(0)
 
+    def _get_next_loop_delay(self) -> float:
+        """Returns how long to sleep before the next torrent loop.
+
+        Loops run every `LoopSleepTimer` seconds while torrents keep changing, once
+        nothing changes the delay doubles up to `MAX_LOOP_SLEEP_MULTIPLIER` times
+        that, but never past the next point where a verdict could change on its own.
+        """
+        if self.last_loop_active:
+            self.loop_sleep_timer = LOOP_SLEEP_TIMER
+            return self.loop_sleep_timer
+        self.loop_sleep_timer = min(
+            self.loop_sleep_timer * 2, LOOP_SLEEP_TIMER * MAX_LOOP_SLEEP_MULTIPLIER
+        )
+        time_now = time.time()
+        deadlines = [time_now + self.loop_sleep_timer]
+        deadlines.extend(deadline for _, deadline in self.torrent_fingerprints.values())
+        for expiring in (self.timed_ignore_cache, self.special_casing_file_check):
+            if (expiry := expiring.next_expiry_in()) is not None:
+                deadlines.append(time_now + expiry)
+        return max(min(deadlines) - time_now, 1)
+
+    def _sleep_until_next_loop(self) -> None:
+        delay = self._get_next_loop_delay()
+        self.logger.trace("Next torrent loop in %.1fs", delay)
+        if self.torrent_feed is None:
+            time.sleep(delay)
+            return
+        # Wake up early if the poller reports a change that can affect a verdict.
+        self.torrent_feed.wait(delay, WAKE_ON_TORRENT_FIELDS)
+
+    def _get_persisted_state(self) -> dict[str, dict[str, float | None]]:
+        time_now = time.time()
+        state = {
+            "cleaned_torrents": dict.fromkeys(self.cleaned_torrents),
+            "sent_to_scan_hashes": dict.fromkeys(self.sent_to_scan_hashes),
+            "sent_to_scan": dict.fromkeys(map(str, self.sent_to_scan)),
+            "scan_commands": dict(self.scan_commands),
+            "files_probed": dict.fromkeys(map(str, self.files_probed)),
+            "recently_queue": dict(self.recently_queue),
+        }
+        # Expiry times are saved as timestamps since the monotonic clock restarts.
+        for name in PERSISTED_EXPIRING_SETS:
+            state[name] = {
+                key: round(time_now + expires_in)
+                for key, expires_in in getattr(self, name).expiring_items()
+            }
+        return state
+
+    def _restore_state(self) -> None:
+        """Loads the state saved by a previous run so it does not start cold.
+
+        Without it every torrent would have its files parsed and probed again and
+        completed torrents could be sent to the Arr to be imported a second time.
+        """
+        if self.state_store is None:
+            return
+        try:
+            state = self.state_store.load()
+        except Exception as e:
+            self.logger.error("Could not load the saved torrent state: %s", e)
+            return
+        time_now = time.time()
+        self.cleaned_torrents.update(state.get("cleaned_torrents", {}))
+        self.sent_to_scan_hashes.update(state.get("sent_to_scan_hashes", {}))
+        self.sent_to_scan.update(map(pathlib.Path, state.get("sent_to_scan", {})))
+        self.scan_commands.update(
+            (key, int(id_)) for key, id_ in state.get("scan_commands", {}).items()
+        )
+        self.files_probed.update(map(pathlib.Path, state.get("files_probed", {})))
+        self.recently_queue.update(state.get("recently_queue", {}))
+        for name in PERSISTED_EXPIRING_SETS:
+            getattr(self, name).restore(
+                (key, expiry - time_now) for key, expiry in state.get(name, {}).items()
+            )
+        self.logger.debug(
+            "Restored torrent state: %s",
+            {kind: len(values) for kind, values in state.items()},
+        )
+
+    def _prune_torrent_state(self, hashes: set[str]) -> None:
+        # Torrents that left the category, including ones removed while qBitrr was
+        # not running, would otherwise stay in these forever.
+        for h in self.cleaned_torrents - hashes:
+            self.cleaned_torrents.discard(h)
+        for h in self.sent_to_scan_hashes - hashes:
+            self.sent_to_scan_hashes.discard(h)
+        for h in self.recently_queue.keys() - hashes:
+            del self.recently_queue[h]
+        # Opened here if no torrent needed its files yet, rows left behind by torrents
+        # removed in the Arr or qBit would otherwise never be dropped.
+        if self.torrent_files_db.created or self.files_db_file.exists():
+            self.torrent_files_db.get()
+            self._delete_torrent_files(self.files_db_hashes - hashes)
+
+    def _delete_torrent_files(self, hashes: set[str]) -> None:
+        if not hashes:
+            return
+        for batch in chunked(list(hashes), 500):
+            self.model_torrent_files.delete().where(
+                self.model_torrent_files.Hash.in_(batch)
+            ).execute()
+        self.files_db_hashes -= hashes
+
+    def get_collection_sizes(self) -> dict[str, tuple[int, int]]:
+        """Returns the number of entries and the approximate size in bytes of each long-lived
+        collection this instance has."""
+        return {
+            name: (len(collection), approximate_size(collection))
+            for name, collection in (
+                (name, getattr(self, name, None))
+                for name in (
+                    "cache",
+                    "requeue_cache",
+                    "queue_file_ids",
+                    "recently_queue",
+                    "sent_to_scan",
+                    "sent_to_scan_hashes",
+                    "scan_commands",
+                    "files_probed",
+                    "cleaned_torrents",
+                    "tracker_cache",
+                    "torrent_fingerprints",
+                    "overseerr_requests_release_cache",
+                    "timed_ignore_cache",
+                    "timed_skip",
+                    "tracker_delay",
+                    "special_casing_file_check",
+                )
+            )
+            if collection is not None
+        }
+
+    def _log_collection_sizes(self) -> None:
+        time_now = time.monotonic()
+        if time_now - self.collections_reported_at < COLLECTION_REPORT_INTERVAL:
+            return
+        self.collections_reported_at = time_now
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.logger.debug(
+            "Collection sizes: %s",
+            ", ".join(
+                "%s=%s (~%s KiB)" % (name, entries, size // 1024)
+                for name, (entries, size) in self.get_collection_sizes().items()
+            ),
+        )
+
+    def _flush_state(self, force: bool = False) -> None:
+        if self.state_store is None or not (force or self.state_store.due):
+            return
+        try:
+            count = self.state_store.flush(self._get_persisted_state())
+            self.logger.trace("Saved %s torrent state changes", count)
+        except Exception as e:
+            self.logger.error("Could not save the torrent state: %s", e)
+
     def run_torrent_loop(self) -> NoReturn:
         run_logs(self.logger)
         self.logger.hnotice("Starting torrent monitoring for %s", self._name)
+        self._restore_state()
         while True:
             try:
                 try:
@@ -3075,6 +3946,7 @@ class Arr:
                                 "Could not connect to %s" % self.uri, type="arr"
                             )
                         self.process_torrents()
+                        self._log_collection_sizes()
                     except NoConnectionrException as e:
                         self.logger.error(e.message)
                         self.manager.qbit_manager.should_delay_torrent_scan = True
@@ -3086,10 +3958,11 @@ class Arr:
                         raise
                     except KeyboardInterrupt:
                         self.logger.hnotice("Detected Ctrl+C - Terminating process")
+                        self._flush_state(force=True)
                         sys.exit(0)
                     except Exception as e:
                         self.logger.error(e, exc_info=sys.exc_info())
-                    time.sleep(LOOP_SLEEP_TIMER)
+                    self._sleep_until_next_loop()
                 except DelayLoopException as e:
                     if e.type == "qbit":
                         self.logger.critical(
@@ -3121,9 +3994,11 @@ class Arr:
                     self.manager.qbit_manager.should_delay_torrent_scan = False
                 except KeyboardInterrupt:
                     self.logger.hnotice("Detected Ctrl+C - Terminating process")
+                    self._flush_state(force=True)
                     sys.exit(0)
             except KeyboardInterrupt:
                 self.logger.hnotice("Detected Ctrl+C - Terminating process")
+                self._flush_state(force=True)
                 sys.exit(0)
 
     def spawn_child_processes(self):
@@ -3161,6 +4036,7 @@ class PlaceHolderArr(Arr):
         self.recently_queue = {}
         self.sent_to_scan = set()
         self.sent_to_scan_hashes = set()
+        self.scan_commands = {}
         self.files_probed = set()
         self.import_torrents = []
         self.change_priority = dict()
@@ -3171,6 +4047,8 @@ class PlaceHolderArr(Arr):
         self.delete = set()
         self.resume = set()
         self.expiring_bool = ExpiringSet(max_age_seconds=10)
+        self.state_store = None
+        self.collections_reported_at = float("-inf")
         self.ignore_torrents_younger_than = CONFIG.get(
             "Settings.IgnoreTorrentsYoungerThan", fallback=600
         )
@@ -3182,39 +4060,40 @@ class PlaceHolderArr(Arr):
         run_logs(self.logger)
         self.search_missing = False
         self.session = None
+        self.torrent_feed = None
+        if self.manager.qbit_manager.torrent_sync is not None:
+            self.torrent_feed = self.manager.qbit_manager.torrent_sync.register_feed(self.category)
+        self.torrent_fingerprints = {}
+        self.loop_sleep_timer = LOOP_SLEEP_TIMER
+        self.last_loop_active = True
         self.logger.hnotice("Starting %s monitor", self._name)
 
     def _process_errored(self):
         # Recheck all torrents marked for rechecking.
         if self.recheck:
             temp = defaultdict(list)
-            updated_recheck = []
-            for h in self.recheck:
-                updated_recheck.append(h)
-                if c := self.manager.qbit_manager.cache.get(h):
-                    temp[c].append(h)
+            updated_recheck = list(self.recheck)
+            categories = self.manager.qbit_manager.torrent_index.categories(updated_recheck)
+            for h, c in categories.items():
+                temp[c].append(h)
             self.manager.qbit.torrents_recheck(torrent_hashes=updated_recheck)
             for k, v in temp.items():
                 self.manager.qbit.torrents_set_category(torrent_hashes=v, category=k)
+            self._request_torrent_sync()
 
-            for k in updated_recheck:
-                self.timed_ignore_cache.add(k)
+            self.timed_ignore_cache.extend(updated_recheck)
             self.recheck.clear()
 
     def _process_failed(self):
         if not (self.delete or self.skip_blacklist):
             return
         to_delete_all = self.delete
-        skip_blacklist = {i.upper() for i in self.skip_blacklist}
+        skip_blacklist = set(self.skip_blacklist)
         if to_delete_all:
             for arr in self.manager.managed_objects.values():
                 payload, hashes = arr.process_entries(to_delete_all)
                 if payload:
-                    for entry, hash_ in payload:
-                        if hash_ in arr.cache:
-                            arr._process_failed_individual(
-                                hash_=hash_, entry=entry, skip_blacklist=skip_blacklist
-                            )
+                    arr._process_failed_entries(payload, skip_blacklist)
         if self.remove_from_qbit or self.skip_blacklist or to_delete_all:
             # Remove all bad torrents from the Client.
             temp_to_delete = set()
@@ -3224,11 +4103,8 @@ class PlaceHolderArr(Arr):
                 temp_to_delete = self.remove_from_qbit.union(self.skip_blacklist)
                 self.manager.qbit.torrents_delete(hashes=temp_to_delete, delete_files=True)
             to_delete_all = to_delete_all.union(temp_to_delete)
-            for h in to_delete_all:
-                if h in self.manager.qbit_manager.name_cache:
-                    del self.manager.qbit_manager.name_cache[h]
-                if h in self.manager.qbit_manager.cache:
-                    del self.manager.qbit_manager.cache[h]
+            self._request_torrent_sync()
+            self.manager.qbit_manager.torrent_index.remove(to_delete_all)
         self.skip_blacklist.clear()
         self.remove_from_qbit.clear()
         self.delete.clear()
@@ -3240,9 +4116,10 @@ class PlaceHolderArr(Arr):
     def process_torrents(self):
         try:
             try:
-                torrents = self.manager.qbit_manager.client.torrents.info.all(
-                    category=self.category, sort="added_on", reverse=False
-                )
+                self.torrent_feed.refresh()
+                # Completed torrents are imported by the Arr instances.
+                self.torrent_feed.pop_completed()
+                torrents = self.torrent_feed.get_torrents()
                 torrents = [t for t in torrents if hasattr(t, "category")]
                 if not len(torrents):
                     raise DelayLoopException(length=5, type="no_downloads")
@@ -3251,10 +4128,8 @@ class PlaceHolderArr(Arr):
                     raise DelayLoopException(length=NO_INTERNET_SLEEP_TIMER, type="internet")
                 if self.manager.qbit_manager.should_delay_torrent_scan:
                     raise DelayLoopException(length=NO_INTERNET_SLEEP_TIMER, type="delay")
+                self.manager.qbit_manager.torrent_index.update(torrents)
                 for torrent in torrents:
-                    if torrent.category != RECHECK_CATEGORY:
-                        self.manager.qbit_manager.cache[torrent.hash] = torrent.category
-                    self.manager.qbit_manager.name_cache[torrent.hash] = torrent.name
                     if torrent.category == FAILED_CATEGORY:
                         # Bypass everything if manually marked as failed
                         self._process_single_torrent_failed_cat(torrent)
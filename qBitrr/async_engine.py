@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Iterable
+
+from qBitrr.per_process import per_process_executor
+
+
+class AsyncEngine:
+    """Runs independent API calls concurrently.
+
+    The qBit, Arr and Overseerr/Ombi clients are all blocking, so each call runs
+    in a worker thread while an asyncio event loop waits for all of them. At most
+    `limit` calls are in flight at once. With a limit of 1 the calls are made one
+    after the other in the calling thread, exactly as if they were called directly.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(limit, 1)
+        self._executor = per_process_executor(self.limit, "async")
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit > 1
+
+    def run(self, calls: Iterable[Callable[[], Any]]) -> list[Any]:
+        """Call every callable and return their results in order.
+
+        If any of the calls raised, the first exception is raised once all of
+        them are done.
+        """
+        calls = list(calls)
+        if not self.enabled or len(calls) < 2:
+            return [call() for call in calls]
+        results = asyncio.run(self._gather(calls))
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def _gather(self, calls: list[Callable[[], Any]]) -> list[Any]:
+        executor = self._executor.get()
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.limit)
+
+        async def run(call: Callable[[], Any]) -> Any:
+            async with semaphore:
+                return await loop.run_in_executor(executor, call)
+
+        return await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import enum
+from typing import Iterable
+
+from qbittorrentapi import TorrentStates
+
+from qBitrr.torrent_sync import TorrentRecord
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Bucket(enum.IntEnum):
+    """The branch of `Arr._process_single_torrent` a torrent falls into."""
+
+    FAILED_CATEGORY = enum.auto()
+    RECHECK_CATEGORY = enum.auto()
+    IGNORED = enum.auto()
+    SPECIAL_FILE_CHECK = enum.auto()
+    IGNORE_CACHE = enum.auto()
+    QUEUED_UPLOAD = enum.auto()
+    STALLED = enum.auto()
+    PERCENTAGE_THRESHOLD = enum.auto()
+    PAUSED = enum.auto()
+    SENT_TO_SCAN = enum.auto()
+    ERRORED = enum.auto()
+    COMPLETED = enum.auto()
+    MISSING_FILES = enum.auto()
+    UPLOADING = enum.auto()
+    DELETE_SLOW = enum.auto()
+    UNAVAILABLE = enum.auto()
+    CLEANED_UP = enum.auto()
+    FILE_CHECK = enum.auto()
+    UNPROCESSED = enum.auto()
+
+
+# Buckets whose handlers only log, torrents in these can be skipped entirely.
+LOG_ONLY_BUCKETS = frozenset(
+    {Bucket.IGNORE_CACHE, Bucket.SENT_TO_SCAN, Bucket.CLEANED_UP, Bucket.UNPROCESSED}
+)
+
+STATE_CODES = {state.value: code for code, state in enumerate(TorrentStates)}
+
+# These mirror Arr.is_ignored_state, Arr.is_uploading_state and Arr.is_complete_state.
+IGNORED_STATES = (
+    TorrentStates.FORCED_DOWNLOAD,
+    TorrentStates.FORCED_UPLOAD,
+    TorrentStates.CHECKING_UPLOAD,
+    TorrentStates.CHECKING_DOWNLOAD,
+    TorrentStates.CHECKING_RESUME_DATA,
+    TorrentStates.ALLOCATING,
+    TorrentStates.MOVING,
+    TorrentStates.QUEUED_DOWNLOAD,
+)
+UPLOADING_STATES = (
+    TorrentStates.UPLOADING,
+    TorrentStates.STALLED_UPLOAD,
+    TorrentStates.QUEUED_UPLOAD,
+)
+COMPLETE_STATES = (
+    TorrentStates.UPLOADING,
+    TorrentStates.STALLED_UPLOAD,
+    TorrentStates.PAUSED_UPLOAD,
+    TorrentStates.QUEUED_UPLOAD,
+)
+DOWNLOADING_STATES = tuple(state for state in TorrentStates if state.is_downloading)
+
+
+def _codes(states: Iterable[TorrentStates]) -> list[int]:
+    return [STATE_CODES[state.value] for state in states]
+
+
+class TorrentSnapshot:
+    """Columnar copy of the torrents of a single loop."""
+
+    def __init__(self, torrents: list[TorrentRecord], recently_queue: dict[str, float]):
+        self.torrents = torrents
+        self.hashes = [t.hash for t in torrents]
+        unknown = STATE_CODES[TorrentStates.UNKNOWN.value]
+        self.state = np.fromiter(
+            (STATE_CODES.get(t.state, unknown) for t in torrents),
+            dtype=np.int8,
+            count=len(torrents),
+        )
+        self.progress = self._column(torrents, "progress", np.float64)
+        self.eta = self._column(torrents, "eta", np.int64)
+        self.availability = self._column(torrents, "availability", np.float64)
+        self.added_on = self._column(torrents, "added_on", np.int64)
+        self.completion_on = self._column(torrents, "completion_on", np.int64)
+        self.seeding_time = self._column(torrents, "seeding_time", np.int64)
+        self.amount_left = self._column(torrents, "amount_left", np.int64)
+        self.has_content_path = self.mask(bool(t.content_path) for t in torrents)
+        self.queued_on = np.fromiter(
+            (recently_queue.get(t.hash, t.added_on) for t in torrents),
+            dtype=np.float64,
+            count=len(torrents),
+        )
+
+    def __len__(self):
+        return len(self.torrents)
+
+    @staticmethod
+    def _column(torrents: list[TorrentRecord], key: str, dtype) -> np.ndarray:
+        return np.fromiter((getattr(t, key) for t in torrents), dtype=dtype, count=len(torrents))
+
+    def mask(self, values: Iterable[bool]) -> np.ndarray:
+        return np.fromiter(values, dtype=bool, count=len(self.torrents))
+
+    def member_of(self, container) -> np.ndarray:
+        return self.mask(h in container for h in self.hashes)
+
+    def in_states(self, states: Iterable[TorrentStates]) -> np.ndarray:
+        return np.isin(self.state, _codes(states))
+
+    def is_state(self, state: TorrentStates) -> np.ndarray:
+        return self.state == STATE_CODES[state.value]
+
+
+def classify(
+    snapshot: TorrentSnapshot,
+    *,
+    failed_category: np.ndarray,
+    recheck_category: np.ndarray,
+    special_file_check: np.ndarray,
+    cleaned: np.ndarray,
+    ignore_cache: np.ndarray,
+    sent_to_scan: np.ndarray,
+    completed_hook: np.ndarray,
+    maximum_eta: np.ndarray,
+    time_now: float,
+    maximum_deletable_percentage: float,
+    ignore_torrents_younger_than: int,
+    do_not_remove_slow: bool,
+) -> np.ndarray:
+    """Returns the `Bucket` of every torrent in the snapshot.
+
+    The conditions are evaluated in the same order as the if/elif chain in
+    `Arr._process_single_torrent`, `np.select` picks the first one that matches.
+    """
+    s = snapshot
+    downloading = s.in_states(DOWNLOADING_STATES)
+    complete = s.in_states(COMPLETE_STATES)
+    paused_download = s.is_state(TorrentStates.PAUSED_DOWNLOAD)
+    old_enough = s.queued_on < time_now - ignore_torrents_younger_than
+    conditions = {
+        Bucket.FAILED_CATEGORY: failed_category,
+        Bucket.RECHECK_CATEGORY: recheck_category,
+        Bucket.IGNORED: s.in_states(IGNORED_STATES),
+        Bucket.SPECIAL_FILE_CHECK: (
+            downloading
+            & ~s.is_state(TorrentStates.METADATA_DOWNLOAD)
+            & ~special_file_check
+            & ~cleaned
+        ),
+        Bucket.IGNORE_CACHE: ignore_cache,
+        Bucket.QUEUED_UPLOAD: s.is_state(TorrentStates.QUEUED_UPLOAD),
+        Bucket.STALLED: s.in_states(
+            (TorrentStates.METADATA_DOWNLOAD, TorrentStates.STALLED_DOWNLOAD)
+        ),
+        Bucket.PERCENTAGE_THRESHOLD: (
+            (s.progress >= maximum_deletable_percentage) & ~complete & cleaned
+        ),
+        Bucket.PAUSED: paused_download & (s.amount_left != 0),
+        Bucket.SENT_TO_SCAN: sent_to_scan & cleaned,
+        Bucket.ERRORED: s.is_state(TorrentStates.ERROR),
+        Bucket.COMPLETED: (
+            (s.added_on > 0)
+            & (s.completion_on != 0)
+            & (s.amount_left == 0)
+            & ~s.is_state(TorrentStates.PAUSED_UPLOAD)
+            & complete
+            & s.has_content_path
+            & ((s.completion_on < time_now - 60) | completed_hook)
+        ),
+        Bucket.MISSING_FILES: s.is_state(TorrentStates.MISSING_FILES),
+        Bucket.UPLOADING: (
+            s.in_states(UPLOADING_STATES)
+            & (s.seeding_time > 1)
+            & (s.amount_left == 0)
+            & (s.added_on > 0)
+            & s.has_content_path
+            & cleaned
+        ),
+        Bucket.DELETE_SLOW: (
+            ~paused_download
+            & downloading
+            & old_enough
+            & (maximum_eta > 0)
+            & (maximum_eta < s.eta)
+            & (not do_not_remove_slow)
+        ),
+        Bucket.UNAVAILABLE: downloading & old_enough & (s.availability < 1) & cleaned,
+        Bucket.CLEANED_UP: downloading & cleaned,
+        Bucket.FILE_CHECK: downloading,
+    }
+    return np.select(
+        list(conditions.values()), list(conditions.keys()), default=Bucket.UNPROCESSED
+    )
@@ -144,6 +144,46 @@ PING_URLS = ENVIRO_CONFIG.settings.ping_urls or CONFIG.get(
 IGNORE_TORRENTS_YOUNGER_THAN = ENVIRO_CONFIG.settings.ignore_torrents_younger_than or CONFIG.get(
     "Settings.IgnoreTorrentsYoungerThan", fallback=600
 )
+VECTORIZED_TORRENT_PROCESSING = (
+    CONFIG.get("Settings.VectorizedTorrentProcessing", fallback=False)
+    if ENVIRO_CONFIG.settings.vectorized_torrent_processing is None
+    else ENVIRO_CONFIG.settings.vectorized_torrent_processing
+)
+WEBHOOK_HOST = (
+    CONFIG.get("Settings.WebhookHost", fallback="127.0.0.1")
+    if ENVIRO_CONFIG.settings.webhook_host is None
+    else ENVIRO_CONFIG.settings.webhook_host
+)
+WEBHOOK_PORT = (
+    CONFIG.get("Settings.WebhookPort", fallback=0)
+    if ENVIRO_CONFIG.settings.webhook_port is None
+    else ENVIRO_CONFIG.settings.webhook_port
+)
+WEBHOOK_TOKEN = (
+    CONFIG.get("Settings.WebhookToken", fallback="")
+    if ENVIRO_CONFIG.settings.webhook_token is None
+    else ENVIRO_CONFIG.settings.webhook_token
+)
+CONCURRENT_REQUESTS = (
+    CONFIG.get("Settings.ConcurrentRequests", fallback=1)
+    if ENVIRO_CONFIG.settings.concurrent_requests is None
+    else ENVIRO_CONFIG.settings.concurrent_requests
+)
+MAX_CACHE_ENTRIES = (
+    CONFIG.get("Settings.MaxCacheEntries", fallback=10000)
+    if ENVIRO_CONFIG.settings.max_cache_entries is None
+    else ENVIRO_CONFIG.settings.max_cache_entries
+)
+MAX_INDEXED_TORRENTS = (
+    CONFIG.get("Settings.MaxIndexedTorrents", fallback=100000)
+    if ENVIRO_CONFIG.settings.max_indexed_torrents is None
+    else ENVIRO_CONFIG.settings.max_indexed_torrents
+)
+FORCE_GRAB_RATE = (
+    CONFIG.get("Settings.ForceGrabRate", fallback=5)
+    if ENVIRO_CONFIG.settings.force_grab_rate is None
+    else ENVIRO_CONFIG.settings.force_grab_rate
+)
 QBIT_DISABLED = (
     CONFIG.get("QBit.Disabled", fallback=False)
     if ENVIRO_CONFIG.qbit.disabled is None
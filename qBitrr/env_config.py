@@ -43,6 +43,14 @@ class AppConfig:
         ignore_torrents_younger_than = environ.var(None, converter=Converter.int)
         ping_urls = environ.var(None, converter=Converter.list)
         ffprobe_auto_update = environ.var(None, converter=Converter.bool)
+        vectorized_torrent_processing = environ.var(None, converter=Converter.bool)
+        webhook_host = environ.var(None)
+        webhook_port = environ.var(None, converter=Converter.int)
+        webhook_token = environ.var(None)
+        concurrent_requests = environ.var(None, converter=Converter.int)
+        max_cache_entries = environ.var(None, converter=Converter.int)
+        max_indexed_torrents = environ.var(None, converter=Converter.int)
+        force_grab_rate = environ.var(None, converter=Converter.int)
 
     @environ.config(prefix="QBIT", frozen=True)
     class Qbit:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pathlib
+import secrets
 from datetime import datetime
 from functools import reduce
 from typing import Any, TypeVar
@@ -116,6 +117,124 @@ def _add_settings_section(config: TOMLDocument):
         "FFprobeAutoUpdate",
         True if ENVIRO_CONFIG.settings.ping_urls is None else ENVIRO_CONFIG.settings.ping_urls,
     )
+    settings.add(nl())
+    settings.add(
+        comment(
+            "Classify all torrents of a category at once using NumPy arrays "
+            "instead of one torrent at a time."
+        )
+    )
+    settings.add(
+        comment("Requires the `fast` extra (`pip install qBitrr[fast]`), ignored otherwise.")
+    )
+    settings.add(
+        "VectorizedTorrentProcessing",
+        False
+        if ENVIRO_CONFIG.settings.vectorized_torrent_processing is None
+        else ENVIRO_CONFIG.settings.vectorized_torrent_processing,
+    )
+    settings.add(nl())
+    settings.add(
+        comment("Address and port to listen on for webhooks, set the port to 0 to disable it")
+    )
+    settings.add(
+        comment(
+            "qBitTorrent can report finished torrents so they are imported straight away, "
+            "set 'Run external program on torrent finished' to:"
+        )
+    )
+    settings.add(
+        comment(
+            'curl -X POST "http://127.0.0.1:6971/torrent/completed'
+            '?hash=%I&category=%L&token=<WebhookToken>"'
+        )
+    )
+    settings.add(
+        comment(
+            "Sonarr/Radarr can report grabs and imports so their queue is polled less often, "
+            "add a Webhook connection (On Grab, On Import, On Health Issue) with the URL:"
+        )
+    )
+    settings.add(
+        comment("http://127.0.0.1:6971/arr/event?category=<Arr category>&token=<WebhookToken>")
+    )
+    settings.add(
+        comment(
+            "Requests without the token, as the 'token' parameter or the X-Webhook-Token "
+            "header, are rejected"
+        )
+    )
+    settings.add(
+        "WebhookHost",
+        "127.0.0.1"
+        if ENVIRO_CONFIG.settings.webhook_host is None
+        else ENVIRO_CONFIG.settings.webhook_host,
+    )
+    settings.add(
+        "WebhookPort",
+        0 if ENVIRO_CONFIG.settings.webhook_port is None else ENVIRO_CONFIG.settings.webhook_port,
+    )
+    settings.add(
+        "WebhookToken",
+        secrets.token_urlsafe(16)
+        if ENVIRO_CONFIG.settings.webhook_token is None
+        else ENVIRO_CONFIG.settings.webhook_token,
+    )
+    settings.add(nl())
+    settings.add(
+        comment(
+            "Maximum number of independent API calls (qBit, Arr, Overseerr/Ombi) and "
+            "torrents each process handles at once"
+        )
+    )
+    settings.add(
+        comment("Set this value to 1 to make every call and process every torrent in order")
+    )
+    settings.add(
+        "ConcurrentRequests",
+        1
+        if ENVIRO_CONFIG.settings.concurrent_requests is None
+        else ENVIRO_CONFIG.settings.concurrent_requests,
+    )
+    settings.add(nl())
+    settings.add(
+        comment(
+            "Maximum number of entries kept in each of the per category caches "
+            "(probed files, imported paths, release dates)"
+        )
+    )
+    settings.add(comment("The oldest entries are dropped first once a cache is full"))
+    settings.add(
+        "MaxCacheEntries",
+        10000
+        if ENVIRO_CONFIG.settings.max_cache_entries is None
+        else ENVIRO_CONFIG.settings.max_cache_entries,
+    )
+    settings.add(nl())
+    settings.add(
+        comment(
+            "Maximum number of torrents kept in the hash -> category/name index "
+            "shared by every category"
+        )
+    )
+    settings.add(comment("The torrents seen the longest ago are dropped first once it is full"))
+    settings.add(
+        "MaxIndexedTorrents",
+        100000
+        if ENVIRO_CONFIG.settings.max_indexed_torrents is None
+        else ENVIRO_CONFIG.settings.max_indexed_torrents,
+    )
+    settings.add(nl())
+    settings.add(
+        comment("Maximum number of force grab requests sent to each Arr instance per second")
+    )
+    settings.add(comment("Set this value to 0 to send them as fast as possible"))
+    settings.add(
+        "ForceGrabRate",
+        5
+        if ENVIRO_CONFIG.settings.force_grab_rate is None
+        else ENVIRO_CONFIG.settings.force_grab_rate,
+    )
     config.add("Settings", settings)
 
 
@@ -567,6 +686,14 @@ def _gen_default_search_table(category: str, cat_default: Table):
         )
     search_table.add("SearchLimit", 5)
     search_table.add(nl())
+    search_table.add(
+        comment(
+            "Maximum number of episodes/movies searched for with a single command, "
+            "each command counts once towards SearchLimit"
+        )
+    )
+    search_table.add("SearchBatchSize", 10)
+    search_table.add(nl())
     search_table.add(comment("Servarr Datapath file path"))
     search_table.add(comment("This is required for any of the search functionality to work"))
     search_table.add(
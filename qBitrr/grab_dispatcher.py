@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from qBitrr.per_process import per_process_executor
+
+
+class GrabDispatcher:
+    """Long-lived pool that force grabs delayed queue items of an Arr instance.
+
+    Ids that are already being grabbed are not submitted again and requests are
+    spaced out to at most `rate` per second (unlimited if 0), so a burst of
+    delayed releases does not flood the Arr with requests.
+    """
+
+    def __init__(self, grab: Callable[[int], Any], workers: int, rate: float):
+        self.grab = grab
+        self.workers = workers
+        self.interval = 1 / rate if rate > 0 else 0
+        self.in_flight: set[int] = set()
+        self._executor = per_process_executor(workers, "grab")
+        self._lock = threading.Lock()
+        self._next_request = 0.0
+
+    def submit(self, ids: Iterable[int]) -> list[int]:
+        """Queues the ids that are not in flight yet and returns them."""
+        with self._lock:
+            submitted = [id_ for id_ in ids if id_ not in self.in_flight]
+            self.in_flight.update(submitted)
+        for id_ in submitted:
+            self._executor.get().submit(self._run, id_)
+        return submitted
+
+    def _wait_for_slot(self) -> None:
+        with self._lock:
+            time_now = time.monotonic()
+            slot = max(self._next_request, time_now)
+            self._next_request = slot + self.interval
+        if slot > time_now:
+            time.sleep(slot - time_now)
+
+    def _run(self, id_: int) -> None:
+        try:
+            self._wait_for_slot()
+            self.grab(id_)
+        finally:
+            with self._lock:
+                self.in_flight.discard(id_)
@@ -16,11 +16,25 @@ from qbittorrentapi.decorators import login_required, response_text
 
 from qBitrr.arss import ArrManager
 from qBitrr.bundled_data import patched_version
-from qBitrr.config import CONFIG, QBIT_DISABLED, SEARCH_ONLY, process_flags
+from qBitrr.config import (
+    APPDATA_FOLDER,
+    CONFIG,
+    LOOP_SLEEP_TIMER,
+    MAX_INDEXED_TORRENTS,
+    QBIT_DISABLED,
+    SEARCH_ONLY,
+    WEBHOOK_HOST,
+    WEBHOOK_PORT,
+    WEBHOOK_TOKEN,
+    process_flags,
+)
 from qBitrr.env_config import ENVIRO_CONFIG
 from qBitrr.ffprobe import FFprobeDownloader
 from qBitrr.logger import run_logs
+from qBitrr.torrent_index import TorrentIndex
+from qBitrr.torrent_sync import TorrentSync
 from qBitrr.utils import ExpiringSet
+from qBitrr.webhook import WebhookServer
 
 CHILD_PROCESSES = []
 
@@ -52,6 +66,7 @@ class qBitManager:
         )
         self._validated_version = False
         self.client = None
+        self.torrent_sync = None
         self.current_qbit_version = None
         if not any([QBIT_DISABLED, SEARCH_ONLY]):
             self.client = qbittorrentapi.Client(
@@ -71,9 +86,11 @@ class qBitManager:
                     "you may experience errors, please report this error."
                 )
             self._version_validator()
+            self.torrent_sync = TorrentSync(self.client)
         self.expiring_bool = ExpiringSet(max_age_seconds=10)
-        self.cache = {}
-        self.name_cache = {}
+        self.torrent_index = TorrentIndex(
+            APPDATA_FOLDER.joinpath("Torrents.db"), max_size=MAX_INDEXED_TORRENTS
+        )
         self.should_delay_torrent_scan = False  # If true torrent scan is delayed by 5 minutes.
         self.child_processes = []
         self.ffprobe_downloader = FFprobeDownloader()
@@ -151,8 +168,56 @@ class qBitManager:
             numb, processes = arr.spawn_child_processes()
             count += numb
             procs.extend(processes)
+        if self.torrent_sync is not None and self.torrent_sync.feeds:
+            self.torrent_sync_process = pathos.helpers.mp.Process(
+                target=self.run_torrent_sync_loop, daemon=True
+            )
+            self.child_processes.append(self.torrent_sync_process)
+            procs.append(self.torrent_sync_process)
+            if WEBHOOK_PORT and WEBHOOK_TOKEN in ("", "CHANGE_ME"):
+                self.logger.error(
+                    "Not listening for webhooks, Settings.WebhookToken has to be set first"
+                )
+            elif WEBHOOK_PORT:
+                self.webhook_process = pathos.helpers.mp.Process(
+                    target=self.run_webhook_server, daemon=True
+                )
+                self.child_processes.append(self.webhook_process)
+                procs.append(self.webhook_process)
         return procs
 
+    def run_webhook_server(self):
+        run_logs(self.logger)
+        try:
+            WebhookServer(
+                WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_TOKEN, self.torrent_sync
+            ).serve_forever()
+        except KeyboardInterrupt:
+            self.logger.hnotice("Detected Ctrl+C - Terminating process")
+            sys.exit(0)
+        except OSError as e:
+            self.logger.error(
+                "Could not listen for webhooks on %s:%s: %s", WEBHOOK_HOST, WEBHOOK_PORT, e
+            )
+
+    def run_torrent_sync_loop(self):
+        run_logs(self.logger)
+        self.logger.hnotice(
+            "Starting shared torrent poller for %s categories", len(self.torrent_sync.feeds)
+        )
+        while True:
+            try:
+                if self.is_alive:
+                    self.torrent_sync.update()
+            except qbittorrentapi.exceptions.APIConnectionError as e:
+                self.logger.warning(e)
+            except KeyboardInterrupt:
+                self.logger.hnotice("Detected Ctrl+C - Terminating process")
+                sys.exit(0)
+            except Exception as e:
+                self.logger.error(e, exc_info=sys.exc_info())
+            self.torrent_sync.sleep(LOOP_SLEEP_TIMER)
+
     def run(self):
         try:
             self.logger.notice("Starting %s child processes", len(self.child_processes))
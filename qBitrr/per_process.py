@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Generic, TypeVar
+
+from peewee import Model, SqliteDatabase
+
+T = TypeVar("T")
+M = TypeVar("M", bound=Model)
+
+
+class PerProcess(Generic[T]):
+    """A value created on first use in every process.
+
+    Database connections and thread pools do not survive a fork, the Arr
+    instances are created in the main process and run in forked ones, so
+    anything of that kind they hold is built by `factory` the first time
+    `get` is called in a process, the main process and every child get
+    their own.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self.factory = factory
+        self._value = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._value = self.factory()
+                    self._pid = pid
+        return self._value
+
+    @property
+    def created(self) -> bool:
+        """Whether `get` was already called in this process."""
+        return self._pid == os.getpid()
+
+
+def per_process_executor(workers: int, name: str) -> PerProcess[ThreadPoolExecutor]:
+    return PerProcess(
+        lambda: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"qBitrr-{name}")
+    )
+
+
+def per_process_sqlite(
+    path: pathlib.Path,
+    model: type[M],
+    name: str,
+    on_connect: Callable[[type[M]], None] | None = None,
+) -> PerProcess[type[M]]:
+    """Binds a copy of `model` named `name` to the SQLite file at `path` in each process.
+
+    `name` is also the table name, the table is created if it does not exist.
+    `on_connect` is called with the bound model before any other thread can use it.
+    """
+
+    def connect() -> type[M]:
+        db = SqliteDatabase(None)
+        db.init(
+            str(path),
+            pragmas={
+                "journal_mode": "wal",
+                "synchronous": 0,
+            },
+        )
+        bound = type(name, (model,), {"Meta": type("Meta", (), {"database": db})})
+        db.connect()
+        db.create_tables([bound])
+        if on_connect is not None:
+            on_connect(bound)
+        return bound
+
+    return PerProcess(connect)
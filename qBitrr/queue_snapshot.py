@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import pathlib
+import threading
+import time
+from typing import Callable
+
+
+class QueueSnapshot:
+    """Download queue of an Arr instance, shared by all of its processes.
+
+    The queue is fetched at most once every `max_age` seconds. Each copy is
+    kept in memory and written to a JSON file, so the torrent and search
+    processes of the same Arr reuse each other's copy instead of both asking
+    the Arr for the whole queue.
+    """
+
+    def __init__(self, path: pathlib.Path, max_age: float, fetch: Callable[[], list[dict]]):
+        self.path = path
+        self.max_age = max_age
+        self.fetch = fetch
+        self.records = None
+        self.fetched_at = 0.0
+        # Bumped by every `invalidate`, a fetch that overlapped one is not kept.
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> list[dict]:
+        time_now = time.time()
+        with self._lock:
+            if self.records is not None and time_now - self.fetched_at < self.max_age:
+                return self.records
+            with contextlib.suppress(OSError, ValueError):
+                fetched_at = self.path.stat().st_mtime
+                if time_now - fetched_at < self.max_age:
+                    with self.path.open(encoding="utf-8") as file:
+                        self.records = json.load(file)
+                    self.fetched_at = fetched_at
+                    return self.records
+            generation = self.generation
+        # Fetched without the lock so `invalidate` never waits on the Arr.
+        records = self.fetch()
+        with self._lock:
+            if generation != self.generation:
+                # The queue changed during the fetch, the next call fetches it again.
+                return records
+            self.records = records
+            self.fetched_at = time_now
+            with contextlib.suppress(OSError):
+                # Written to a temporary file first so readers never see a partial file.
+                temp = self.path.with_name(f"{self.path.name}.{os.getpid()}")
+                with temp.open("w", encoding="utf-8") as file:
+                    json.dump(records, file)
+                os.replace(temp, self.path)
+        return records
+
+    def invalidate(self) -> None:
+        """Drops the snapshot, the next `get` fetches the queue again."""
+        with self._lock:
+            self.generation += 1
+            self.records = None
+            with contextlib.suppress(OSError):
+                self.path.unlink()
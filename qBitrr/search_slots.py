@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+
+class SearchSlots:
+    """Number of search commands an Arr instance is working on.
+
+    The count is read from the Arr database at most once every `max_age`
+    seconds. Searches posted in between are counted locally, so the search
+    loop can keep within the command limit without asking the database
+    before every search.
+
+    The Arr instance can take a while to write posted commands to its
+    database, so a search is only dropped from the local count once a
+    recount includes it, or `grace` seconds after it was posted.
+    """
+
+    def __init__(self, count: Callable[[], int], max_age: float, grace: float | None = None):
+        self.count = count
+        self.max_age = max_age
+        self.grace = max_age * 2 if grace is None else grace
+        self.counted = 0
+        self.counted_at = None
+        # (time posted, number of searches) for searches the last count may not include.
+        self.pending: deque[tuple[float, int]] = deque()
+        self.posted_since = 0
+        self._lock = threading.Lock()
+
+    def active(self) -> int:
+        with self._lock:
+            time_now = time.monotonic()
+            if self.counted_at is None or time_now - self.counted_at >= self.max_age:
+                counted = self.count()
+                if counted >= self.counted + self.posted_since:
+                    # Everything posted since the last count has been recorded.
+                    self.pending.clear()
+                    self.posted_since = 0
+                else:
+                    while self.pending and time_now - self.pending[0][0] >= self.grace:
+                        self.posted_since -= self.pending.popleft()[1]
+                self.counted = counted
+                self.counted_at = time_now
+            return self.counted + self.posted_since
+
+    def posted(self, count: int = 1) -> None:
+        """Records searches posted since the last count."""
+        with self._lock:
+            self.pending.append((time.monotonic(), count))
+            self.posted_since += count
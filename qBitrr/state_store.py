@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pathlib
+import time
+
+from peewee import SqliteDatabase, chunked
+
+from qBitrr.per_process import per_process_sqlite
+from qBitrr.tables import TorrentStateModel
+
+
+class StateStore:
+    """On-disk copy of the in-memory state of a torrent loop.
+
+    The state is a mapping of kind -> {key: value}. Writes are deferred: the
+    loop hands over its current state every time it finishes, but it is only
+    written every `flush_interval` seconds and only the keys that were added,
+    changed or removed since the previous write touch the database.
+    """
+
+    def __init__(self, path: pathlib.Path, flush_interval: int):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._model = per_process_sqlite(path, TorrentStateModel, "TorrentState")
+        self.flushed: dict[str, dict[str, float | None]] = {}
+        self.last_flush = time.monotonic()
+
+    @property
+    def model(self) -> type[TorrentStateModel]:
+        return self._model.get()
+
+    @property
+    def db(self) -> SqliteDatabase:
+        return self.model._meta.database
+
+    def load(self) -> dict[str, dict[str, float | None]]:
+        state: dict[str, dict[str, float | None]] = {}
+        query = self.model.select(self.model.Kind, self.model.Key, self.model.Value)
+        for kind, key, value in query.tuples():
+            state.setdefault(kind, {})[key] = value
+        self.flushed = {kind: dict(values) for kind, values in state.items()}
+        return state
+
+    @property
+    def due(self) -> bool:
+        return time.monotonic() - self.last_flush >= self.flush_interval
+
+    def flush(self, state: dict[str, dict[str, float | None]]) -> int:
+        """Writes the changes since the last flush, returns how many rows changed."""
+        count = 0
+        with self.db.atomic():
+            for kind, current in state.items():
+                previous = self.flushed.get(kind, {})
+                removed = list(previous.keys() - current.keys())
+                changed = [
+                    (kind, key, value)
+                    for key, value in current.items()
+                    if key not in previous or previous[key] != value
+                ]
+                for batch in chunked(removed, 500):
+                    self.model.delete().where(
+                        (self.model.Kind == kind) & (self.model.Key.in_(batch))
+                    ).execute()
+                for batch in chunked(changed, 300):
+                    self.model.insert_many(
+                        batch, fields=[self.model.Kind, self.model.Key, self.model.Value]
+                    ).on_conflict_replace().execute()
+                count += len(removed) + len(changed)
+                self.flushed[kind] = dict(current)
+        self.last_flush = time.monotonic()
+        return count
@@ -1,4 +1,12 @@
-from peewee import BooleanField, CharField, DateTimeField, IntegerField, Model, TextField
+from peewee import (
+    BooleanField,
+    CharField,
+    DateTimeField,
+    FloatField,
+    IntegerField,
+    Model,
+    TextField,
+)
 
 
 class FilesQueued(Model):
@@ -50,3 +58,28 @@ class MovieQueueModel(Model):
 class EpisodeQueueModel(Model):
     EntryId = IntegerField(unique=True)
     Completed = BooleanField(default=False)
+
+
+class TorrentFilesModel(Model):
+    Hash = CharField()
+    FilterHash = CharField()
+    Files = TextField()
+
+    class Meta:
+        indexes = ((("Hash", "FilterHash"), True),)
+
+
+class TorrentStateModel(Model):
+    Kind = CharField()
+    Key = TextField()
+    Value = FloatField(null=True)
+
+    class Meta:
+        indexes = ((("Kind", "Key"), True),)
+
+
+class TorrentIndexModel(Model):
+    Hash = CharField(primary_key=True)
+    Category = CharField(null=True)
+    Name = TextField(null=True)
+    Updated = FloatField(index=True)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import pathlib
+import time
+from typing import Collection, Iterable
+
+from peewee import EXCLUDED, SqliteDatabase, chunked, fn
+
+from qBitrr.config import RECHECK_CATEGORY
+from qBitrr.per_process import per_process_sqlite
+from qBitrr.tables import TorrentIndexModel
+from qBitrr.torrent_sync import TorrentRecord
+
+
+class TorrentIndex:
+    """Hash -> category and hash -> name index shared by every process.
+
+    Each torrent loop records the torrents it sees, so a process can look up
+    torrents that only another process has seen, e.g. the original category
+    of a torrent moved to the recheck category. The index lives in a single
+    SQLite file and keeps at most `max_size` torrents, the ones that were
+    seen the longest ago are dropped first.
+    """
+
+    def __init__(self, path: pathlib.Path, max_size: int, touch_interval: float = 3600):
+        self.path = path
+        self.max_size = max_size
+        self.touch_interval = touch_interval
+        self.touched_at = 0.0
+        self._model = per_process_sqlite(path, TorrentIndexModel, "TorrentIndexEntry")
+
+    @property
+    def model(self) -> type[TorrentIndexModel]:
+        return self._model.get()
+
+    @property
+    def db(self) -> SqliteDatabase:
+        return self.model._meta.database
+
+    def update(self, torrents: Iterable[TorrentRecord], seen: Collection[str] = ()) -> None:
+        """Records the category and name of the torrents and when `seen` were last seen.
+
+        Torrents in the recheck category keep the category they had before. The
+        last seen time of torrents that did not change is only written every
+        `touch_interval` seconds, it only decides which torrents are dropped first.
+        """
+        time_now = time.time()
+        rows = [
+            (
+                t.hash,
+                t.category if t.category != RECHECK_CATEGORY else None,
+                t.name,
+                time_now,
+            )
+            for t in torrents
+        ]
+        touch = seen if time_now - self.touched_at >= self.touch_interval else ()
+        if not rows and not touch:
+            return
+        model = self.model
+        with self.db.atomic():
+            for batch in chunked(rows, 200):
+                model.insert_many(
+                    batch, fields=[model.Hash, model.Category, model.Name, model.Updated]
+                ).on_conflict(
+                    conflict_target=[model.Hash],
+                    update={
+                        model.Category: fn.COALESCE(EXCLUDED.Category, model.Category),
+                        model.Name: EXCLUDED.Name,
+                        model.Updated: EXCLUDED.Updated,
+                    },
+                ).execute()
+            for batch in chunked(list(touch), 500):
+                model.update(Updated=time_now).where(model.Hash.in_(batch)).execute()
+            if touch:
+                self.touched_at = time_now
+            excess = model.select().count() - self.max_size
+            if excess > 0:
+                oldest = model.select(model.Hash).order_by(model.Updated).limit(excess)
+                model.delete().where(model.Hash.in_(oldest)).execute()
+
+    def categories(self, hashes: Iterable[str]) -> dict[str, str]:
+        """Returns the known category of each of the torrents."""
+        return self._lookup(hashes, "Category")
+
+    def names(self, hashes: Iterable[str]) -> dict[str, str]:
+        """Returns the known name of each of the torrents."""
+        return self._lookup(hashes, "Name")
+
+    def _lookup(self, hashes: Iterable[str], field: str) -> dict[str, str]:
+        column = getattr(self.model, field)
+        found = {}
+        for batch in chunked(list(hashes), 500):
+            query = self.model.select(self.model.Hash, column).where(
+                (self.model.Hash.in_(batch)) & (column.is_null(False))
+            )
+            found.update(query.tuples())
+        return found
+
+    def remove(self, hashes: Iterable[str]) -> None:
+        with self.db.atomic():
+            for batch in chunked(list(hashes), 500):
+                self.model.delete().where(self.model.Hash.in_(batch)).execute()
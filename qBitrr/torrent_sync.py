@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import time
+from collections import defaultdict
+from typing import AbstractSet, Iterable
+
+import pathos
+import qbittorrentapi
+from qbittorrentapi import TorrentStates
+
+from qBitrr.logger import run_logs
+from qBitrr.utils import infohash
+
+TORRENT_STATES = {state.value: state for state in TorrentStates}
+
+
+class TorrentRecord:
+    """Snapshot of the fields of a torrent that qBitrr reads.
+
+    Built straight from the qBitTorrent JSON, unlike `TorrentDictionary` it
+    does not keep a copy of every field nor a reference to the client, so
+    creating one per torrent every loop is cheap.
+    """
+
+    _defaults = {
+        "hash": "",
+        "name": "",
+        "category": "",
+        "state": "",
+        "tags": "",
+        "content_path": "",
+        "tracker": "",
+        "trackers_count": 0,
+        "progress": 0.0,
+        "availability": 0.0,
+        "ratio": 0.0,
+        "ratio_limit": 0.0,
+        "eta": 0,
+        "amount_left": 0,
+        "size": 0,
+        "total_size": 0,
+        "added_on": 0,
+        "completion_on": 0,
+        "last_activity": 0,
+        "seeding_time": 0,
+        "seeding_time_limit": 0,
+        "dl_limit": 0,
+        "up_limit": 0,
+        "super_seeding": False,
+    }
+    __slots__ = tuple(_defaults)
+
+    def __init__(self, data: dict):
+        get = data.get
+        for field, default in self._defaults.items():
+            setattr(self, field, get(field, default))
+
+    @property
+    def state_enum(self) -> TorrentStates:
+        return TORRENT_STATES.get(self.state, TorrentStates.UNKNOWN)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
+
+
+class TorrentTable:
+    """A local table of torrents keyed by hash, updated by applying qBitTorrent deltas."""
+
+    def __init__(self, client: qbittorrentapi.Client):
+        self.client = client
+        self.torrents: dict[str, dict] = {}
+
+    def apply(
+        self, full_update: bool, torrents: dict[str, dict], removed: Iterable[str]
+    ) -> set[str]:
+        """Apply a set of changes to the table.
+
+        Hashes may be in any case, the table is keyed by their canonical form.
+        Returns the hashes of every torrent that was added, changed or removed.
+        """
+        changed = set()
+        if full_update:
+            changed.update(self.torrents)
+            self.torrents = {}
+        for hash_, delta in torrents.items():
+            hash_ = infohash(hash_)
+            entry = self.torrents.get(hash_)
+            if entry is None:
+                entry = self.torrents[hash_] = {"hash": hash_}
+            entry.update(delta)
+            changed.add(hash_)
+        for hash_ in removed:
+            hash_ = infohash(hash_)
+            self.torrents.pop(hash_, None)
+            changed.add(hash_)
+        return changed
+
+    def get_torrents(self, category: str | None = None) -> list[TorrentRecord]:
+        """Returns all torrents in the specified category, oldest first."""
+        torrents = [
+            TorrentRecord(entry)
+            for entry in self.torrents.values()
+            if category is None or entry.get("category") == category
+        ]
+        torrents.sort(key=lambda t: t.added_on)
+        return torrents
+
+
+class TorrentFeed(TorrentTable):
+    """Read side of the shared torrent poller for a single category.
+
+    The poller pushes the changes for this category into a queue, the
+    consumer drains it at the start of every loop to bring its table up to date
+    without ever talking to the qBitTorrent WebUI.
+
+    The queue also carries the hashes of torrents reported as completed by
+    qBitTorrent and the events sent by the Arr instance through the webhook server.
+
+    After changing torrents the consumer calls `request_update`, so the poller
+    picks up the result straight away instead of on its next scheduled poll.
+    """
+
+    def __init__(self, category: str, client: qbittorrentapi.Client, wake_up=None):
+        super().__init__(client)
+        self.category = category
+        self.queue = pathos.helpers.mp.Queue()
+        self.wake_up = wake_up
+        self.completed: set[str] = set()
+        self.arr_events: list[dict] = []
+
+    def put(self, full_update: bool, torrents: dict[str, dict], removed: Iterable[str]) -> None:
+        self.queue.put(("sync", (full_update, torrents, list(removed))))
+
+    def request_update(self) -> None:
+        """Asks the poller to fetch the latest changes now."""
+        if self.wake_up is not None:
+            self.wake_up.set()
+
+    def put_completed(self, hash_: str) -> None:
+        self.queue.put(("completed", hash_))
+
+    def put_arr_event(self, event: dict) -> None:
+        self.queue.put(("arr_event", event))
+
+    def pop_arr_events(self) -> list[dict]:
+        """Returns and forgets the Arr events received since the last call."""
+        events, self.arr_events = self.arr_events, []
+        return events
+
+    def pop_completed(self) -> set[str]:
+        """Returns and forgets the torrents reported as completed since the last call."""
+        completed, self.completed = self.completed, set()
+        return completed
+
+    def _handle(self, message: tuple, fields: AbstractSet[str] = frozenset()) -> bool:
+        kind, payload = message
+        if kind == "completed":
+            self.completed.add(payload)
+            return True
+        if kind == "arr_event":
+            self.arr_events.append(payload)
+            return True
+        full_update, torrents, removed = payload
+        self.apply(full_update, torrents, removed)
+        return bool(
+            full_update
+            or removed
+            or any(not fields.isdisjoint(delta) for delta in torrents.values())
+        )
+
+    def refresh(self) -> None:
+        """Apply every pending change pushed by the poller."""
+        while True:
+            try:
+                message = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._handle(message)
+
+    def wait(self, timeout: float, fields: AbstractSet[str]) -> bool:
+        """Block until the poller pushes a change to any of `fields`, or until timeout.
+
+        Changes are applied as they arrive, returns True if a change or a completed
+        torrent woke it up.
+        """
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                message = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                return False
+            if self._handle(message, fields):
+                return True
+        return False
+
+    def get_torrents(self, category: str | None = None) -> list[TorrentRecord]:
+        return super().get_torrents(category or self.category)
+
+
+class TorrentSync(TorrentTable):
+    """Keeps a local torrent table in sync with qBitTorrent.
+
+    Uses the `/api/v2/sync/maindata` endpoint, qBitTorrent keeps track of the
+    last response it sent (`rid`) and only returns what changed since then,
+    so each update costs bandwidth proportional to the churn in the client
+    rather than to the number of torrents in it.
+
+    A single instance is owned by the `qBitManager`, every update is routed by
+    category to the registered `TorrentFeed` objects.
+    """
+
+    def __init__(self, client: qbittorrentapi.Client):
+        super().__init__(client)
+        self.rid = 0
+        self.feeds: dict[str, TorrentFeed] = {}
+        self.wake_up = pathos.helpers.mp.Event()
+        self.logger = logging.getLogger("qBitrr.TorrentSync")
+        run_logs(self.logger)
+
+    def register_feed(self, category: str) -> TorrentFeed:
+        if category not in self.feeds:
+            self.feeds[category] = TorrentFeed(category, self.client, self.wake_up)
+        return self.feeds[category]
+
+    def sleep(self, timeout: float) -> None:
+        """Sleeps until the next update is due or a consumer requests one."""
+        self.wake_up.wait(timeout)
+        self.wake_up.clear()
+
+    def reset(self) -> None:
+        """Drop the local table, the next update will be a full update."""
+        self.rid = 0
+        self.torrents = {}
+
+    def update(self) -> set[str]:
+        """Apply the latest changes reported by qBitTorrent to the local table.
+
+        Returns the hashes of every torrent that was added, changed or removed.
+        """
+        data = self.client.sync_maindata(rid=self.rid)
+        full_update = bool(data.get("full_update"))
+        # Canonical from here on, so lookups below and in the feeds agree with the table.
+        torrents = {infohash(h): dict(d) for h, d in (data.get("torrents") or {}).items()}
+        removed = [infohash(h) for h in data.get("torrents_removed") or ()]
+        previous = {
+            h: self.torrents[h].get("category")
+            for h in itertools.chain(torrents, removed)
+            if h in self.torrents
+        }
+        if full_update:
+            self.logger.trace("Full torrent sync requested by qBitTorrent (rid=%s)", self.rid)
+        changed = self.apply(full_update, torrents, removed)
+        self.rid = data.get("rid", 0)
+        self.logger.trace(
+            "Torrent sync: %s changed, %s tracked (rid=%s)",
+            len(changed),
+            len(self.torrents),
+            self.rid,
+        )
+        if self.feeds:
+            self._publish(full_update, torrents, removed, previous)
+        return changed
+
+    def _publish(
+        self,
+        full_update: bool,
+        torrents: dict[str, dict],
+        removed: list[str],
+        previous: dict[str, str],
+    ) -> None:
+        if full_update:
+            snapshots = defaultdict(dict)
+            for hash_, entry in self.torrents.items():
+                snapshots[entry.get("category")][hash_] = entry
+            for category, feed in self.feeds.items():
+                feed.put(True, snapshots.get(category, {}), [])
+            return
+        updates = defaultdict(dict)
+        gone = defaultdict(set)
+        for hash_, delta in torrents.items():
+            entry = self.torrents[hash_]
+            category = entry.get("category")
+            if hash_ in previous and previous[hash_] == category:
+                updates[category][hash_] = delta
+            else:
+                # Torrent is new or moved to a different category,
+                # its new consumer needs the whole entry.
+                gone[previous.get(hash_)].add(hash_)
+                updates[category][hash_] = entry
+        for hash_ in removed:
+            gone[previous.get(hash_)].add(hash_)
+        for category, feed in self.feeds.items():
+            if category in updates or category in gone:
+                feed.put(False, updates.get(category, {}), gone.get(category, ()))
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import itertools
 import logging
+import math
 import pathlib
 import random
 import socket
+import sys
+import threading
 import time
-from typing import Iterator
+from collections import OrderedDict, deque
+from typing import Any, Iterable, Iterator, Mapping
 
 import ping3
 from cachetools import TTLCache
@@ -16,6 +21,18 @@ logger = logging.getLogger("qBitrr.Utils")
 
 CACHE = TTLCache(maxsize=50, ttl=60)
 
+_monotonic = time.monotonic
+
+
+def infohash(value: str) -> str:
+    """Returns the canonical form of a torrent hash.
+
+    qBit reports hashes in lower case while the Arrs report them in upper case.
+    Every hash is stored lower case and interned, so the many sets and dicts
+    keyed by hash share a single string per torrent.
+    """
+    return sys.intern(value.lower())
+
 
 def absolute_file_paths(directory: pathlib.Path | str) -> Iterator[pathlib.Path]:
     error = True
@@ -125,66 +142,213 @@ def is_connected(hostname):
         return _basic_ping(hostname)
 
 
+class BoundedSet:
+    """A thread-safe set that keeps at most `maxsize` items.
+
+    Once full, adding an item drops the one that was added the longest ago.
+    """
+
+    def __init__(self, maxsize: int, items: Iterable = ()):
+        assert maxsize > 0
+        self.maxsize = maxsize
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.update(items)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({', '.join(map(str, self))})"
+
+    def add(self, item):
+        with self._lock:
+            self._items[item] = None
+            self._items.move_to_end(item)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def update(self, items: Iterable):
+        for item in items:
+            self.add(item)
+
+    def discard(self, item):
+        with self._lock:
+            self._items.pop(item, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+
 class ExpiringSet:
+    """A set whose items expire `max_age_seconds` after they were last added.
+
+    Every item lives for the same amount of time, so a deque of (expiry, item)
+    in insertion order is also ordered by expiry and expired items are evicted
+    from its left in bulk. The dict of item -> expiry is what membership tests
+    use, a deque entry whose expiry no longer matches it was superseded by a
+    later add or a removal and is simply dropped.
+
+    Every mutation holds the lock. `add` only evicts once the oldest entry is
+    due, and `extend` reads the clock and takes the lock once for all items.
+    """
+
     def __init__(self, *args, **kwargs):
         max_age_seconds = kwargs.get("max_age_seconds", 0)
         assert max_age_seconds > 0
         self.age = max_age_seconds
-        self.container = {}
-        for arg in args:
-            self.add(arg)
+        self.container: dict[Any, float] = {}
+        self._queue: deque[tuple[float, Any]] = deque()
+        self._next_eviction = math.inf
+        self._lock = threading.Lock()
+        self.extend(args)
 
     def __repr__(self):
-        self.__update__()
-        return f"{self.__class__.__name__}({', '.join(self.container.keys())})"
+        return f"{self.__class__.__name__}({', '.join(map(str, self))})"
 
     def extend(self, args):
         """Add several items at once."""
-        for arg in args:
-            self.add(arg)
+        now = _monotonic()
+        expiry = now + self.age
+        with self._lock:
+            if now >= self._next_eviction:
+                self._evict(now)
+            for value in args:
+                self.container[value] = expiry
+                self._queue.append((expiry, value))
+            if self._queue and self._next_eviction == math.inf:
+                self._next_eviction = expiry
 
     def add(self, value):
-        self.container[value] = time.time()
+        now = _monotonic()
+        expiry = now + self.age
+        with self._lock:
+            if now >= self._next_eviction:
+                self._evict(now)
+            self.container[value] = expiry
+            self._queue.append((expiry, value))
+            if self._next_eviction == math.inf:
+                self._next_eviction = expiry
 
     def remove(self, item):
-        del self.container[item]
+        with self._lock:
+            del self.container[item]
+
+    def discard(self, item):
+        with self._lock:
+            self.container.pop(item, None)
 
     def contains(self, value):
-        if value not in self.container:
-            return False
-        if time.time() - self.container[value] > self.age:
-            del self.container[value]
-            return False
-        return True
+        expiry = self.container.get(value)
+        return expiry is not None and expiry > _monotonic()
 
     __contains__ = contains
 
+    def next_expiry_in(self) -> float | None:
+        """Returns the number of seconds until the next item expires."""
+        now = _monotonic()
+        with self._lock:
+            self._evict(now)
+            for expiry, value in self._queue:
+                if self.container.get(value) == expiry:
+                    return expiry - now
+        return None
+
+    def expiring_items(self) -> list[tuple[Any, float]]:
+        """Returns every item with the number of seconds until it expires."""
+        now = _monotonic()
+        with self._lock:
+            self._evict(now)
+            return [(value, expiry - now) for value, expiry in self.container.items()]
+
+    def restore(self, items: Iterable[tuple[Any, float]]) -> None:
+        """Adds items that expire in the given number of seconds, capped to the max age."""
+        now = _monotonic()
+        with self._lock:
+            for value, expires_in in items:
+                if expires_in > 0:
+                    self.container[value] = now + min(expires_in, self.age)
+            # Every entry is rebuilt from the container, ordered by expiry.
+            self._queue = deque(
+                sorted(
+                    ((expiry, value) for value, expiry in self.container.items()),
+                    key=lambda entry: entry[0],
+                )
+            )
+            self._next_eviction = self._queue[0][0] if self._queue else math.inf
+
+    def _evict(self, now: float) -> None:
+        # Must be called with the lock held.
+        queue, container = self._queue, self.container
+        while queue and queue[0][0] <= now:
+            expiry, value = queue.popleft()
+            if container.get(value) == expiry:
+                container.pop(value, None)
+        # Re-added items leave stale entries behind, drop them once they dominate.
+        if len(queue) > 2 * len(container) + 32:
+            queue = self._queue = deque(
+                (expiry, value) for expiry, value in queue if container.get(value) == expiry
+            )
+        self._next_eviction = queue[0][0] if queue else math.inf
+
+    def _items(self) -> list:
+        with self._lock:
+            self._evict(_monotonic())
+            return list(self.container)
+
     def __getitem__(self, index):
-        self.__update__()
-        return list(self.container.keys())[index]
+        return self._items()[index]
 
     def __iter__(self):
-        self.__update__()
-        return iter(self.container.copy())
+        return iter(self._items())
 
     def __len__(self):
-        self.__update__()
-        return len(self.container)
+        with self._lock:
+            self._evict(_monotonic())
+            return len(self.container)
 
     def __copy__(self):
-        self.__update__()
         temp = ExpiringSet(max_age_seconds=self.age)
-        temp.container = self.container.copy()
+        with self._lock:
+            self._evict(_monotonic())
+            temp.container = self.container.copy()
+            temp._queue = self._queue.copy()
+            temp._next_eviction = self._next_eviction
         return temp
 
-    def __update__(self):
-        for k, b in self.container.copy().items():
-            if time.time() - b > self.age:
-                del self.container[k]
-                return False
-
     def __hash__(self):
-        return hash(*(self.container.keys()))
+        return hash(frozenset(self._items()))
 
     def __eq__(self, other):
         return self.__hash__() == other.__hash__()
+
+
+def approximate_size(obj: Any, depth: int = 2) -> int:
+    """Returns roughly how many bytes a collection and the items in it use.
+
+    Nested containers are followed `depth` levels deep. Objects shared with
+    other collections, like the interned torrent hashes, are counted in each
+    of them, so the sizes of several collections should not be added up.
+    """
+    if isinstance(obj, ExpiringSet):
+        return approximate_size(obj.container, depth) + approximate_size(obj._queue, depth)
+    if isinstance(obj, BoundedSet):
+        return approximate_size(obj._items, depth)
+    size = sys.getsizeof(obj)
+    if depth == 0 or isinstance(obj, (str, bytes)):
+        return size
+    if isinstance(obj, Mapping):
+        items = itertools.chain.from_iterable(obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        items = obj
+    else:
+        return size
+    return size + sum(approximate_size(item, depth - 1) for item in items)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hmac
+import json
+import logging
+import re
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+from qBitrr.logger import run_logs
+from qBitrr.torrent_sync import TorrentSync
+from qBitrr.utils import infohash
+
+# Error messages can quote the request line, the token in it is masked before logging.
+TOKEN_RE = re.compile(r"(token=)[^&\s'\"]*", re.IGNORECASE)
+
+
+class WebhookServer:
+    """Small HTTP server that lets other programs notify qBitrr of events.
+
+    qBitTorrent can report finished torrents from
+    "Run external program on torrent finished", e.g.
+
+        curl -X POST "http://127.0.0.1:6971/torrent/completed?hash=%I&category=%L&token=<token>"
+
+    which lets qBitrr import them straight away instead of on a later loop.
+
+    Sonarr and Radarr can report their events through a Webhook connection
+    (Settings > Connect) with the URL
+
+        http://127.0.0.1:6971/arr/event?category=sonarr-tv&token=<token>
+
+    where `category` is the qBit category of the Arr instance.
+
+    Every request has to carry `token`, as the `token` parameter or the
+    `X-Webhook-Token` header, anything else is rejected.
+    """
+
+    def __init__(self, host: str, port: int, token: str, torrent_sync: TorrentSync):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.torrent_sync = torrent_sync
+        self.logger = logging.getLogger("qBitrr.Webhook")
+        run_logs(self.logger)
+        self.routes: dict[str, Callable[[dict[str, str], Any], HTTPStatus]] = {
+            "/torrent/completed": self.torrent_completed,
+            "/arr/event": self.arr_event,
+        }
+
+    def torrent_completed(self, params: dict[str, str], payload: Any) -> HTTPStatus:
+        if not params.get("hash"):
+            return HTTPStatus.BAD_REQUEST
+        hash_ = infohash(params["hash"])
+        category = params.get("category")
+        if category in self.torrent_sync.feeds:
+            feeds = [self.torrent_sync.feeds[category]]
+        elif category:
+            self.logger.trace("Ignoring completed torrent in unmanaged category: %s", category)
+            return HTTPStatus.ACCEPTED
+        else:
+            # Without a category every consumer is told, the ones that do not know the
+            # torrent ignore it.
+            feeds = list(self.torrent_sync.feeds.values())
+        self.logger.debug("Torrent completed: %s (%s)", hash_, category)
+        for feed in feeds:
+            feed.put_completed(hash_)
+        return HTTPStatus.ACCEPTED
+
+    def arr_event(self, params: dict[str, str], payload: Any) -> HTTPStatus:
+        if not isinstance(payload, dict) or "eventType" not in payload:
+            return HTTPStatus.BAD_REQUEST
+        category = params.get("category")
+        feed = self.torrent_sync.feeds.get(category)
+        if feed is None:
+            self.logger.trace("Ignoring Arr event for unmanaged category: %s", category)
+            return HTTPStatus.NOT_FOUND
+        event_type = payload["eventType"]
+        if event_type == "Health":
+            self.logger.warning(
+                "%s health issue: %s", category, payload.get("message", "Unknown issue")
+            )
+            return HTTPStatus.ACCEPTED
+        if event_type == "Test":
+            # Not passed on, the consumer would take it as a sign the Arr sends events.
+            self.logger.notice("Received test event for %s", category)
+            return HTTPStatus.ACCEPTED
+        if "episodes" in payload:
+            ids = [e["id"] for e in payload["episodes"] if "id" in e]
+        elif "movie" in payload:
+            ids = [payload["movie"]["id"]] if "id" in payload["movie"] else []
+        else:
+            ids = []
+        self.logger.debug("%s event for %s: %s", event_type, category, ids)
+        # Only the fields the consumer needs are passed on.
+        feed.put_arr_event(
+            {"eventType": event_type, "downloadId": payload.get("downloadId"), "ids": ids}
+        )
+        return HTTPStatus.ACCEPTED
+
+    def is_authorized(self, token: str | None) -> bool:
+        if not self.token or not token:
+            return False
+        return hmac.compare_digest(token.encode(), self.token.encode())
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                url = urlsplit(self.path)
+                route = server.routes.get(url.path.rstrip("/"))
+                if route is None:
+                    self.send_error(HTTPStatus.NOT_FOUND)
+                    return
+                params = dict(parse_qsl(url.query))
+                if not server.is_authorized(
+                    params.pop("token", None) or self.headers.get("X-Webhook-Token")
+                ):
+                    server.logger.warning(
+                        "Rejected webhook without a valid token from %s", self.address_string()
+                    )
+                    self.send_error(HTTPStatus.UNAUTHORIZED)
+                    return
+                payload = None
+                if length := int(self.headers.get("Content-Length") or 0):
+                    body = self.rfile.read(length)
+                    if self.headers.get_content_type() == "application/json":
+                        try:
+                            payload = json.loads(body)
+                        except ValueError:
+                            self.send_error(HTTPStatus.BAD_REQUEST)
+                            return
+                    else:
+                        params.update(parse_qsl(body.decode()))
+                try:
+                    status = route(params, payload)
+                except Exception as e:
+                    server.logger.error(e, exc_info=e)
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            # Every route changes state, so GET is left unsupported.
+            do_POST = _handle
+
+            def log_request(self, code="-", size="-") -> None:
+                # The request line carries the token in its query string.
+                server.logger.trace(
+                    "%s - %s %s %s",
+                    self.address_string(),
+                    self.command,
+                    urlsplit(self.path).path,
+                    getattr(code, "value", code),
+                )
+
+            def log_message(self, format: str, *args) -> None:
+                server.logger.trace(
+                    "%s - %s", self.address_string(), TOKEN_RE.sub(r"\1***", format % args)
+                )
+
+        return Handler
+
+    def serve_forever(self) -> None:
+        httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self.logger.hnotice("Listening for webhooks on %s:%s", self.host, self.port)
+        httpd.serve_forever()
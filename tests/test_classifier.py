@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+from qbittorrentapi import TorrentStates
+
+np = pytest.importorskip("numpy")
+
+from qBitrr.arss import FAILED_CATEGORY, RECHECK_CATEGORY, Arr  # noqa: E402
+from qBitrr.classifier import Bucket, TorrentSnapshot, classify  # noqa: E402
+from qBitrr.torrent_sync import TorrentRecord  # noqa: E402
+
+NOW = 1_700_000_000.0
+CATEGORY = "sonarr-tv"
+MAXIMUM_ETA = 3600
+IGNORE_TORRENTS_YOUNGER_THAN = 600
+MAXIMUM_DELETABLE_PERCENTAGE = 0.95
+
+# The handler `Arr._process_single_torrent` calls for each bucket, the handlers that
+# serve several buckets are told apart by their arguments.
+HANDLERS = {
+    "_process_single_torrent_failed_cat": Bucket.FAILED_CATEGORY,
+    "_process_single_torrent_recheck_cat": Bucket.RECHECK_CATEGORY,
+    "_process_single_torrent_ignored": Bucket.IGNORED,
+    "_process_single_torrent_added_to_ignore_cache": Bucket.IGNORE_CACHE,
+    "_process_single_torrent_queued_upload": Bucket.QUEUED_UPLOAD,
+    "_process_single_torrent_percentage_threshold": Bucket.PERCENTAGE_THRESHOLD,
+    "_process_single_torrent_paused": Bucket.PAUSED,
+    "_process_single_torrent_already_sent_to_scan": Bucket.SENT_TO_SCAN,
+    "_process_single_torrent_errored": Bucket.ERRORED,
+    "_process_single_torrent_fully_completed_torrent": Bucket.COMPLETED,
+    "_process_single_torrent_missing_files": Bucket.MISSING_FILES,
+    "_process_single_torrent_uploading": Bucket.UPLOADING,
+    "_process_single_torrent_delete_slow": Bucket.DELETE_SLOW,
+    "_process_single_torrent_already_cleaned_up": Bucket.CLEANED_UP,
+    "_process_single_torrent_unprocessed": Bucket.UNPROCESSED,
+}
+
+
+def make_torrent(rng: random.Random, i: int) -> TorrentRecord:
+    """Returns a torrent whose fields sit on either side of every threshold."""
+    return TorrentRecord(
+        {
+            "hash": f"{i:040x}",
+            "name": f"torrent-{i}",
+            "category": rng.choice([CATEGORY] * 8 + [FAILED_CATEGORY, RECHECK_CATEGORY]),
+            "state": rng.choice([state.value for state in TorrentStates] + ["notAState"]),
+            "content_path": rng.choice(["", f"/downloads/torrent-{i}"]),
+            "progress": rng.choice([0.0, 0.5, MAXIMUM_DELETABLE_PERCENTAGE, 1.0]),
+            "availability": rng.choice([-1, 0.5, 1, 2.5]),
+            "eta": rng.choice([0, MAXIMUM_ETA - 1, MAXIMUM_ETA, MAXIMUM_ETA + 1, 8_640_000]),
+            "amount_left": rng.choice([0, 1024]),
+            "added_on": rng.choice([0, NOW - IGNORE_TORRENTS_YOUNGER_THAN - 1, NOW - 10]),
+            "completion_on": rng.choice([0, NOW - 61, NOW - 60, NOW - 10]),
+            "seeding_time": rng.choice([0, 1, 2, 3600]),
+        }
+    )
+
+
+def make_arr(rng: random.Random, torrents: list[TorrentRecord]) -> Arr:
+    """Returns an `Arr` with only the state `_process_single_torrent` reads."""
+    arr = Arr.__new__(Arr)
+
+    def some_hashes() -> set[str]:
+        return {t.hash for t in torrents if rng.random() < 0.3}
+
+    arr.special_casing_file_check = some_hashes()
+    arr.cleaned_torrents = some_hashes()
+    arr.timed_ignore_cache = some_hashes()
+    arr.sent_to_scan_hashes = some_hashes()
+    arr.completed_hooks = some_hashes()
+    arr.recently_queue = {
+        t.hash: rng.choice([NOW - IGNORE_TORRENTS_YOUNGER_THAN - 1, NOW - 10])
+        for t in torrents
+        if rng.random() < 0.3
+    }
+    arr.maximum_deletable_percentage = MAXIMUM_DELETABLE_PERCENTAGE
+    arr.ignore_torrents_younger_than = IGNORE_TORRENTS_YOUNGER_THAN
+    arr.do_not_remove_slow = False
+    arr.logger = SimpleNamespace(trace=lambda *args, **kwargs: None)
+    # Torrents in the failed and recheck categories are looked up under their own category.
+    arr.manager = SimpleNamespace(
+        managed_objects={
+            category: SimpleNamespace(sent_to_scan_hashes=arr.sent_to_scan_hashes)
+            for category in (CATEGORY, FAILED_CATEGORY, RECHECK_CATEGORY)
+        }
+    )
+    return arr
+
+
+def scalar_buckets(
+    arr: Arr, torrents: list[TorrentRecord], monkeypatch: pytest.MonkeyPatch
+) -> list[Bucket]:
+    buckets = []
+    monkeypatch.setattr(time, "time", lambda: NOW)
+    monkeypatch.setattr(arr, "_process_single_torrent_trackers", lambda torrent: None)
+    monkeypatch.setattr(arr, "_should_leave_alone", lambda torrent: (False, MAXIMUM_ETA))
+    for name, bucket in HANDLERS.items():
+        monkeypatch.setattr(arr, name, lambda *args, bucket=bucket: buckets.append(bucket))
+    monkeypatch.setattr(
+        arr,
+        "_process_single_torrent_process_files",
+        lambda torrent, special_case=False: buckets.append(
+            Bucket.SPECIAL_FILE_CHECK if special_case else Bucket.FILE_CHECK
+        ),
+    )
+    monkeypatch.setattr(
+        arr,
+        "_process_single_torrent_stalled_torrent",
+        lambda torrent, extra: buckets.append(
+            Bucket.STALLED if extra == "Stalled State" else Bucket.UNAVAILABLE
+        ),
+    )
+    for i, torrent in enumerate(torrents, 1):
+        arr._process_single_torrent(torrent)
+        assert len(buckets) == i, torrent
+    return buckets
+
+
+def vectorized_buckets(arr: Arr, torrents: list[TorrentRecord]) -> list[Bucket]:
+    snapshot = TorrentSnapshot(torrents, arr.recently_queue)
+    categories = [t.category for t in torrents]
+    buckets = classify(
+        snapshot,
+        failed_category=snapshot.mask(c == FAILED_CATEGORY for c in categories),
+        recheck_category=snapshot.mask(c == RECHECK_CATEGORY for c in categories),
+        special_file_check=snapshot.member_of(arr.special_casing_file_check),
+        cleaned=snapshot.member_of(arr.cleaned_torrents),
+        ignore_cache=snapshot.member_of(arr.timed_ignore_cache),
+        sent_to_scan=snapshot.member_of(arr.sent_to_scan_hashes),
+        completed_hook=snapshot.member_of(arr.completed_hooks),
+        maximum_eta=np.full(len(snapshot), MAXIMUM_ETA, dtype=np.int64),
+        time_now=NOW,
+        maximum_deletable_percentage=arr.maximum_deletable_percentage,
+        ignore_torrents_younger_than=arr.ignore_torrents_younger_than,
+        do_not_remove_slow=arr.do_not_remove_slow,
+    )
+    return [Bucket(bucket) for bucket in buckets]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("do_not_remove_slow", [False, True])
+def test_classify_matches_process_single_torrent(seed, do_not_remove_slow, monkeypatch):
+    rng = random.Random(seed)
+    torrents = [make_torrent(rng, i) for i in range(5000)]
+    arr = make_arr(rng, torrents)
+    arr.do_not_remove_slow = do_not_remove_slow
+    expected = scalar_buckets(arr, torrents, monkeypatch)
+    actual = vectorized_buckets(arr, torrents)
+    mismatches = [
+        (torrent, want, got)
+        for torrent, want, got in zip(torrents, expected, actual)
+        if want != got
+    ]
+    assert not mismatches, mismatches[:5]
+    # Make sure the torrents reached every branch, or the comparison proves little.
+    assert set(expected) == set(Bucket) - ({Bucket.DELETE_SLOW} if do_not_remove_slow else set())
+
+
+def test_classify_empty_snapshot():
+    arr = make_arr(random.Random(0), [])
+    assert vectorized_buckets(arr, []) == []
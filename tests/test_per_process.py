@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+
+import pytest
+
+from qBitrr.per_process import PerProcess, per_process_sqlite
+from qBitrr.tables import TorrentStateModel
+
+
+def test_value_is_created_once_per_process():
+    calls = []
+    value = PerProcess(lambda: calls.append(os.getpid()) or object())
+    assert not value.created
+    assert value.get() is value.get()
+    assert value.created
+    assert calls == [os.getpid()]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_process_creates_its_own():
+    value = PerProcess(os.getpid)
+    assert value.get() == os.getpid()
+
+    def child(conn) -> None:
+        conn.send((value.created, value.get()))
+
+    context = multiprocessing.get_context("fork")
+    parent_conn, child_conn = context.Pipe()
+    process = context.Process(target=child, args=(child_conn,))
+    process.start()
+    created, pid = parent_conn.recv()
+    process.join()
+    assert not created
+    assert pid == process.pid != os.getpid()
+
+
+def test_sqlite_model_keeps_the_table_name(tmp_path):
+    loaded = []
+    model = per_process_sqlite(
+        tmp_path / "state.db", TorrentStateModel, "TorrentState", loaded.append
+    ).get()
+    assert model._meta.table_name == "torrentstate"
+    assert loaded == [model]
+    model.insert(Kind="k", Key="a", Value=1.0).execute()
+    reopened = per_process_sqlite(tmp_path / "state.db", TorrentStateModel, "TorrentState").get()
+    assert [(r.Kind, r.Key, r.Value) for r in reopened.select()] == [("k", "a", 1.0)]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from qBitrr.queue_snapshot import QueueSnapshot
+
+
+def test_get_reuses_the_shared_file(tmp_path):
+    path = tmp_path / "Sonarr.queue.json"
+    first = QueueSnapshot(path, 60, lambda: [{"id": 1}])
+    assert first.get() == [{"id": 1}]
+    second = QueueSnapshot(path, 60, lambda: [{"id": 2}])
+    assert second.get() == [{"id": 1}]
+    first.invalidate()
+    assert not path.exists()
+    assert first.get() == [{"id": 1}]
+    assert second.get() == [{"id": 1}]
+
+
+def test_invalidate_during_fetch_is_not_undone(tmp_path):
+    path = tmp_path / "Sonarr.queue.json"
+
+    def fetch() -> list[dict]:
+        # Another thread changes the queue while this one waits on the Arr.
+        snapshot.invalidate()
+        return [{"id": 1}]
+
+    snapshot = QueueSnapshot(path, 60, fetch)
+    assert snapshot.get() == [{"id": 1}]
+    assert snapshot.records is None
+    assert not path.exists()
+    snapshot.fetch = lambda: [{"id": 2}]
+    assert snapshot.get() == [{"id": 2}]
+    assert path.exists()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import queue
+import random
+
+import pytest
+
+from qBitrr.torrent_sync import TorrentSync, TorrentTable
+
+CATEGORIES = ["sonarr-tv", "radarr-movies", "unmanaged", ""]
+STATES = ["downloading", "stalledDL", "uploading", "pausedUP", "error"]
+
+
+class FakeClient:
+    """Plays back `sync_maindata` responses like qBitTorrent builds them.
+
+    The first response and every `full_update` one carry every torrent,
+    the others only the fields that changed and the hashes that were removed.
+    """
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.torrents: dict[str, dict] = {}
+        self.sent: dict[str, dict] = {}
+        self.rid = 0
+        self.next_hash = 0
+
+    def mutate(self) -> None:
+        rng = self.rng
+        for _ in range(rng.randint(0, 20)):
+            action = rng.random()
+            if action < 0.3 or not self.torrents:
+                hash_ = f"{self.next_hash:040x}"
+                self.next_hash += 1
+                self.torrents[hash_] = {
+                    "name": f"torrent-{hash_[-4:]}",
+                    "category": rng.choice(CATEGORIES),
+                    "state": rng.choice(STATES),
+                    "progress": rng.random(),
+                    "added_on": self.next_hash,
+                }
+            elif action < 0.45:
+                del self.torrents[rng.choice(list(self.torrents))]
+            else:
+                torrent = self.torrents[rng.choice(list(self.torrents))]
+                field = rng.choice(["category", "state", "progress", "name"])
+                torrent[field] = {
+                    "category": lambda: rng.choice(CATEGORIES),
+                    "state": lambda: rng.choice(STATES),
+                    "progress": rng.random,
+                    "name": lambda: f"renamed-{rng.random()}",
+                }[field]()
+
+    def sync_maindata(self, rid: int = 0) -> dict:
+        full_update = rid == 0 or self.rng.random() < 0.05
+        if full_update:
+            torrents = {h: dict(t) for h, t in self.torrents.items()}
+            removed = []
+        else:
+            torrents = {}
+            for hash_, torrent in self.torrents.items():
+                previous = self.sent.get(hash_, {})
+                delta = {k: v for k, v in torrent.items() if previous.get(k) != v}
+                if delta:
+                    torrents[hash_] = delta
+            removed = [h for h in self.sent if h not in self.torrents]
+        self.sent = {h: dict(t) for h, t in self.torrents.items()}
+        self.rid += 1
+        data = {"rid": self.rid, "torrents": torrents, "torrents_removed": removed}
+        if full_update:
+            data["full_update"] = True
+        return data
+
+    def expected(self, category: str | None = None) -> dict[str, dict]:
+        return {
+            hash_: {"hash": hash_, **torrent}
+            for hash_, torrent in self.torrents.items()
+            if category is None or torrent["category"] == category
+        }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_deltas_rebuild_the_full_state(seed):
+    client = FakeClient(random.Random(seed))
+    sync = TorrentSync(client)
+    feeds = [sync.register_feed(category) for category in CATEGORIES[:2]]
+    for feed in feeds:
+        # Delivered in order within this process, without the feeder thread of mp.Queue.
+        feed.queue = queue.Queue()
+    for _ in range(300):
+        client.mutate()
+        sync.update()
+        assert sync.torrents == client.expected()
+        for feed in feeds:
+            feed.refresh()
+            assert feed.torrents == client.expected(feed.category)
+            assert [t.hash for t in feed.get_torrents()] == sorted(
+                client.expected(feed.category), key=lambda h: client.torrents[h]["added_on"]
+            )
+
+
+def test_apply_reports_changed_hashes():
+    table = TorrentTable(client=None)
+    assert table.apply(True, {"A" * 40: {"state": "downloading"}}, []) == {"a" * 40}
+    assert table.torrents == {"a" * 40: {"hash": "a" * 40, "state": "downloading"}}
+    assert table.apply(False, {"a" * 40: {"progress": 0.5}}, []) == {"a" * 40}
+    assert table.torrents["a" * 40] == {"hash": "a" * 40, "state": "downloading", "progress": 0.5}
+    assert table.apply(False, {}, ["a" * 40]) == {"a" * 40}
+    assert table.torrents == {}
+    table.apply(False, {"b" * 40: {}}, [])
+    # A full update drops everything it does not list.
+    assert table.apply(True, {"c" * 40: {}}, []) == {"b" * 40, "c" * 40}
+    assert table.torrents.keys() == {"c" * 40}
+
+
+def test_hashes_in_any_case_update_the_same_torrent():
+    table = TorrentTable(client=None)
+    table.apply(True, {"a" * 40: {"category": "sonarr-tv", "name": "Show"}}, [])
+    assert table.apply(False, {"A" * 40: {"progress": 0.5}}, []) == {"a" * 40}
+    assert table.torrents == {
+        "a" * 40: {"hash": "a" * 40, "category": "sonarr-tv", "name": "Show", "progress": 0.5}
+    }
+    table.apply(False, {}, ["A" * 40])
+    assert table.torrents == {}
+
+
+def test_sync_routes_upper_case_hashes():
+    class Client:
+        responses = [
+            {"rid": 1, "full_update": True, "torrents": {"a" * 40: {"category": "sonarr-tv"}}},
+            {"rid": 2, "torrents": {"A" * 40: {"progress": 0.5}}},
+            {"rid": 3, "torrents_removed": ["A" * 40]},
+        ]
+
+        def sync_maindata(self, rid: int = 0) -> dict:
+            return self.responses[rid]
+
+    sync = TorrentSync(Client())
+    feed = sync.register_feed("sonarr-tv")
+    feed.queue = queue.Queue()
+    sync.update()
+    sync.update()
+    feed.refresh()
+    assert feed.torrents == {
+        "a" * 40: {"hash": "a" * 40, "category": "sonarr-tv", "progress": 0.5}
+    }
+    sync.update()
+    feed.refresh()
+    assert sync.torrents == {} and feed.torrents == {}
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import random
+import threading
+from copy import copy
+
+import pytest
+
+from qBitrr import utils
+from qBitrr.utils import BoundedSet, ExpiringSet, approximate_size
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(utils, "_monotonic", clock)
+    return clock
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_expiring_set_matches_a_plain_dict(seed, clock):
+    """Random operations give the same result as a dict of item -> expiry."""
+    rng = random.Random(seed)
+    expiring = ExpiringSet(max_age_seconds=10)
+    expected: dict[int, float] = {}
+
+    def alive() -> set[int]:
+        return {k for k, expiry in expected.items() if expiry > clock.now}
+
+    for _ in range(5000):
+        action = rng.random()
+        key = rng.randrange(200)
+        if action < 0.4:
+            expiring.add(key)
+            expected[key] = clock.now + 10
+        elif action < 0.5:
+            keys = [rng.randrange(200) for _ in range(rng.randrange(10))]
+            expiring.extend(keys)
+            expected.update(dict.fromkeys(keys, clock.now + 10))
+        elif action < 0.6:
+            expiring.discard(key)
+            expected.pop(key, None)
+        elif action < 0.65 and key in alive():
+            expiring.remove(key)
+            del expected[key]
+        elif action < 0.9:
+            assert (key in expiring) == (key in alive())
+        else:
+            assert len(expiring) == len(alive())
+            assert set(expiring) == alive()
+        clock.now += rng.choice([0, 0.5, 1, 3])
+    assert set(copy(expiring)) == alive()
+    # Stale queue entries left by re-adds and removals are compacted.
+    assert len(expiring._queue) <= 2 * len(expiring.container) + 32
+
+
+def test_expiring_set_restore_keeps_remaining_time(clock):
+    expiring = ExpiringSet(max_age_seconds=10)
+    expiring.add("a")
+    clock.now += 4
+    items = dict(expiring.expiring_items())
+    assert items == {"a": 6}
+    restored = ExpiringSet(max_age_seconds=10)
+    restored.restore([("a", 6), ("b", 60), ("c", -1)])
+    assert dict(restored.expiring_items()) == {"a": 6, "b": 10}
+    assert restored.next_expiry_in() == 6
+    clock.now += 6
+    assert set(restored) == {"b"}
+
+
+def test_expiring_set_concurrent_add_and_discard():
+    expiring = ExpiringSet(max_age_seconds=600)
+
+    def churn(offset: int) -> None:
+        for i in range(20000):
+            expiring.add(offset + i % 100)
+            expiring.discard(offset + (i + 50) % 100)
+
+    threads = [threading.Thread(target=churn, args=(n * 1000,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(expiring) == len(set(expiring)) <= 400
+
+
+def test_bounded_set_drops_the_oldest():
+    bounded = BoundedSet(3)
+    for i in range(5):
+        bounded.add(i)
+    assert list(bounded) == [2, 3, 4]
+    assert 1 not in bounded and 4 in bounded
+
+
+def test_approximate_size_counts_items():
+    empty = ExpiringSet(max_age_seconds=10)
+    full = ExpiringSet(max_age_seconds=10)
+    full.extend(f"{i:040x}" for i in range(1000))
+    assert approximate_size(full) > approximate_size(empty) + 1000 * 40
+    assert approximate_size({"a": ["x" * 1000]}) > 1000
+    assert approximate_size({"a": ["x" * 1000]}, depth=1) < 1000
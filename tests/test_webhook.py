@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from qBitrr.webhook import WebhookServer
+
+TOKEN = "s3cret-token"
+
+
+class FakeFeed:
+    def __init__(self):
+        self.completed = []
+        self.arr_events = []
+
+    def put_completed(self, hash_: str) -> None:
+        self.completed.append(hash_)
+
+    def put_arr_event(self, event: dict) -> None:
+        self.arr_events.append(event)
+
+
+@pytest.fixture
+def server():
+    feed = FakeFeed()
+    webhook = WebhookServer("127.0.0.1", 0, TOKEN, SimpleNamespace(feeds={"sonarr-tv": feed}))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), webhook._make_handler())
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield SimpleNamespace(webhook=webhook, feed=feed, port=httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(server, path: str, payload=None, method: str = "POST", headers=None) -> int:
+    data = b"" if payload is None else json.dumps(payload).encode()
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{server.port}{path}",
+        data=data if method == "POST" else None,
+        method=method,
+        headers={"Content-Type": "application/json", **(headers or {})},
+    )
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_requests_need_the_token(server):
+    path = "/torrent/completed?hash=" + "A" * 40
+    assert request(server, path) == 401
+    assert request(server, path + "&token=wrong") == 401
+    assert request(server, path + "&token=" + TOKEN) == 202
+    assert request(server, path, headers={"X-Webhook-Token": TOKEN}) == 202
+    # Hashes are stored in their canonical form.
+    assert server.feed.completed == ["a" * 40, "a" * 40]
+
+
+def test_get_is_not_accepted(server):
+    assert request(server, "/torrent/completed?hash=abc&token=" + TOKEN, method="GET") != 202
+    assert server.feed.completed == []
+
+
+def test_test_events_are_not_passed_on(server):
+    path = "/arr/event?category=sonarr-tv&token=" + TOKEN
+    assert request(server, path, {"eventType": "Test"}) == 202
+    assert server.feed.arr_events == []
+    assert request(server, path, {"eventType": "Grab", "downloadId": "ABC"}) == 202
+    assert server.feed.arr_events == [{"eventType": "Grab", "downloadId": "ABC", "ids": []}]
+
+
+def test_token_is_not_logged(server, caplog):
+    caplog.set_level(1, logger="qBitrr.Webhook")
+    request(server, "/torrent/completed?hash=abc&token=" + TOKEN)
+    request(server, "/torrent/completed?hash=abc&token=" + TOKEN, method="GET")
+    assert caplog.records
+    assert all(TOKEN not in record.getMessage() for record in caplog.records)